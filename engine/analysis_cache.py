@@ -0,0 +1,270 @@
+# engine/analysis_cache.py
+
+import glob
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Cache directory and size budget (override with env vars)
+ANALYSIS_CACHE_DIR = os.environ.get("ANALYSIS_CACHE_DIR", "analysis_cache")
+MAX_CACHE_BYTES = int(os.environ.get("ANALYSIS_CACHE_MAX_BYTES", 512 * 1024 ** 2))
+
+# Source folders whose code is part of every cache key
+_CODE_DIRS = ("engine", "pipeline")
+
+_MANIFEST = "__manifest__"
+
+
+def price_fingerprint(prices: pd.Series) -> str:
+    """
+    Hash of the price dates and values; any revised or added bar changes it.
+    """
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(prices.index.values.astype("datetime64[ns]")).tobytes())
+    digest.update(np.ascontiguousarray(prices.to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """
+    Hash of the engine and pipeline sources, so cached results expire on code changes.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha256()
+
+    for folder in _CODE_DIRS:
+        for path in sorted(glob.glob(os.path.join(root, folder, "*.py"))):
+            digest.update(os.path.basename(path).encode())
+            with open(path, "rb") as f:
+                digest.update(f.read())
+
+    return digest.hexdigest()
+
+
+def cache_key(
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    prices: pd.Series,
+    params: Optional[dict] = None
+) -> str:
+    """
+    Content address of an analysis: ticker, dates, price data, parameters and code.
+    """
+    payload = json.dumps(
+        {
+            "ticker": ticker,
+            "start_date": str(start_date),
+            "end_date": str(end_date),
+            "prices": price_fingerprint(prices),
+            "params": params or {},
+            "code": code_version()
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# -------------------------
+# Encoding: JSON manifest + native arrays
+# -------------------------
+
+def _add_array(arrays: dict, array: np.ndarray) -> str:
+    name = f"a{len(arrays)}"
+    arrays[name] = array
+    return name
+
+
+def _encode_array(array: np.ndarray, arrays: dict) -> dict:
+    # Object arrays (e.g. None / Timestamp mixes) cannot be stored without pickle
+    if array.dtype == object:
+        return {"__list__": [_encode(v, arrays) for v in array.tolist()]}
+    return {"__ndarray__": _add_array(arrays, np.ascontiguousarray(array))}
+
+
+def _encode_index(index: pd.Index, arrays: dict) -> dict:
+    if isinstance(index, pd.MultiIndex):
+        return {
+            "__multi__": [_encode_index(index.get_level_values(i), arrays) for i in range(index.nlevels)],
+            "names": [_encode(name, arrays) for name in index.names]
+        }
+    if isinstance(index, pd.RangeIndex):
+        return {"__range__": [index.start, index.stop, index.step], "name": _encode(index.name, arrays)}
+    encoded = _encode_array(index.to_numpy(), arrays)
+    encoded["name"] = _encode(index.name, arrays)
+    if isinstance(index, pd.DatetimeIndex) and index.freq is not None:
+        encoded["freq"] = index.freqstr
+    return encoded
+
+
+def _encode(obj, arrays: dict):
+    if obj is None or isinstance(obj, (bool, str)):
+        return obj
+    if obj is pd.NaT:
+        return {"__nat__": True}
+    if isinstance(obj, np.generic):
+        return {"__scalar__": obj.dtype.str, "value": obj.item()}
+    if isinstance(obj, (int, float)):
+        return obj
+    if isinstance(obj, pd.Timestamp):
+        return {"__timestamp__": obj.isoformat()}
+    if isinstance(obj, np.ndarray):
+        return _encode_array(obj, arrays)
+    if isinstance(obj, pd.Series):
+        return {
+            "__series__": _encode_array(obj.to_numpy(), arrays),
+            "index": _encode_index(obj.index, arrays),
+            "name": _encode(obj.name, arrays)
+        }
+    if isinstance(obj, pd.DataFrame):
+        # Columns by position; labels (dtype and name included) stored as an index
+        return {
+            "__frame__": [_encode_array(obj.iloc[:, j].to_numpy(), arrays) for j in range(obj.shape[1])],
+            "columns": _encode_index(obj.columns, arrays),
+            "index": _encode_index(obj.index, arrays)
+        }
+    if isinstance(obj, tuple):
+        return {"__tuple__": [_encode(v, arrays) for v in obj]}
+    if isinstance(obj, list):
+        return [_encode(v, arrays) for v in obj]
+    if isinstance(obj, dict):
+        # Plain JSON object when keys allow it, else (key, value) pairs keep key types
+        if all(isinstance(k, str) and not k.startswith("__") for k in obj):
+            return {k: _encode(v, arrays) for k, v in obj.items()}
+        return {"__dict__": [[_encode(k, arrays), _encode(v, arrays)] for k, v in obj.items()]}
+
+    raise TypeError(f"Cannot cache object of type {type(obj).__name__}")
+
+
+def _decode_array(spec: dict, arrays) -> np.ndarray:
+    if "__list__" in spec:
+        return np.array([_decode(v, arrays) for v in spec["__list__"]], dtype=object)
+    return arrays[spec["__ndarray__"]]
+
+
+def _decode_index(spec: dict, arrays) -> pd.Index:
+    if "__multi__" in spec:
+        return pd.MultiIndex.from_arrays(
+            [_decode_index(level, arrays) for level in spec["__multi__"]],
+            names=[_decode(name, arrays) for name in spec["names"]]
+        )
+    name = _decode(spec["name"], arrays)
+    if "__range__" in spec:
+        return pd.RangeIndex(*spec["__range__"], name=name)
+    index = pd.Index(_decode_array(spec, arrays), name=name, tupleize_cols=False)
+    if "freq" in spec:
+        index = pd.DatetimeIndex(index, freq=spec["freq"])
+    return index
+
+
+def _decode(obj, arrays):
+    if isinstance(obj, list):
+        return [_decode(v, arrays) for v in obj]
+    if not isinstance(obj, dict):
+        return obj
+    if "__nat__" in obj:
+        return pd.NaT
+    if "__scalar__" in obj:
+        return np.dtype(obj["__scalar__"]).type(obj["value"])
+    if "__timestamp__" in obj:
+        return pd.Timestamp(obj["__timestamp__"])
+    if "__ndarray__" in obj or "__list__" in obj:
+        return _decode_array(obj, arrays)
+    if "__series__" in obj:
+        return pd.Series(
+            _decode_array(obj["__series__"], arrays),
+            index=_decode_index(obj["index"], arrays),
+            name=_decode(obj["name"], arrays)
+        )
+    if "__frame__" in obj:
+        frame = pd.DataFrame(
+            {j: _decode_array(spec, arrays) for j, spec in enumerate(obj["__frame__"])},
+            index=_decode_index(obj["index"], arrays)
+        )
+        frame.columns = _decode_index(obj["columns"], arrays)
+        return frame
+    if "__tuple__" in obj:
+        return tuple(_decode(v, arrays) for v in obj["__tuple__"])
+    if "__dict__" in obj:
+        return {_decode(k, arrays): _decode(v, arrays) for k, v in obj["__dict__"]}
+    return {k: _decode(v, arrays) for k, v in obj.items()}
+
+
+# -------------------------
+# Store / load with LRU eviction
+# -------------------------
+
+def _cache_path(key: str, cache_dir: Optional[str]) -> str:
+    return os.path.join(cache_dir or ANALYSIS_CACHE_DIR, f"{key}.npz")
+
+
+def load_analysis(key: str, cache_dir: Optional[str] = None) -> Optional[dict]:
+    """
+    Return the cached result for a key, or None on a miss.
+    """
+    path = _cache_path(key, cache_dir)
+
+    if not os.path.exists(path):
+        return None
+
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+
+    # Touch the entry so eviction sees it as recently used
+    os.utime(path)
+
+    manifest = json.loads(str(arrays.pop(_MANIFEST)))
+    return _decode(manifest, arrays)
+
+
+def save_analysis(
+    key: str,
+    result: dict,
+    cache_dir: Optional[str] = None,
+    max_bytes: Optional[int] = None
+):
+    """
+    Store a result under its key, then evict least recently used entries
+    until the cache directory fits in max_bytes.
+    """
+    arrays = {}
+    manifest = json.dumps(_encode(result, arrays))
+    arrays[_MANIFEST] = np.array(manifest)
+
+    path = _cache_path(key, cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+    evict(cache_dir, max_bytes)
+
+
+def evict(cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+    """
+    Delete least recently used cache entries until the total size fits in max_bytes.
+    """
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    entries = []
+
+    for path in glob.glob(os.path.join(cache_dir or ANALYSIS_CACHE_DIR, "*.npz")):
+        stat = os.stat(path)
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
@@ -0,0 +1,83 @@
+# engine/analysis_context.py
+
+import threading
+from functools import cached_property
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from engine.returns import compute_log_returns
+from engine.risk import max_drawdown
+from engine.stability import drawdown_series, rolling_sharpe_surface
+
+
+class AnalysisContext:
+    """
+    Shared intermediates for one price series.
+
+    Every value is computed on first access and reused by all pipelines,
+    so returns, running peaks and drawdowns are built once per analysis.
+    Cached series are shared and must not be modified in place.
+    """
+
+    def __init__(self, prices: pd.Series):
+        self.prices = prices
+        self._rolling = {}
+        self._rolling_lock = threading.Lock()
+
+    @cached_property
+    def returns(self) -> pd.Series:
+        """Daily log returns."""
+        return compute_log_returns(self.prices)
+
+    @cached_property
+    def cumulative_returns(self) -> pd.Series:
+        """Growth of 1 invested at the first price."""
+        return self.prices / self.prices.iloc[0]
+
+    @cached_property
+    def downside_returns(self) -> pd.Series:
+        """Negative daily log returns only."""
+        return self.returns[self.returns < 0]
+
+    @cached_property
+    def sorted_returns(self) -> np.ndarray:
+        """Daily log returns in ascending order (for VaR / CVaR)."""
+        return np.sort(self.returns.values)
+
+    @cached_property
+    def cumulative_max(self) -> pd.Series:
+        """Running peak of the price series."""
+        return self.prices.cummax()
+
+    @cached_property
+    def drawdown(self) -> pd.Series:
+        """Drawdown from the running peak at each date."""
+        return drawdown_series(self.prices, self.cumulative_max)
+
+    @cached_property
+    def max_drawdown(self) -> float:
+        """Deepest drawdown over the whole series."""
+        return max_drawdown(self.prices, self.drawdown)
+
+    def rolling_surface(self, windows: Sequence[int], trading_days: int = 252) -> pd.DataFrame:
+        """
+        Rolling annualized mean, volatility and Sharpe ratio per window
+        (see engine.stability.rolling_sharpe_surface). Each window is
+        computed once; windows not yet cached are added in one pass.
+        """
+        windows = list(dict.fromkeys(windows))
+
+        with self._rolling_lock:
+            missing = [w for w in windows if (w, trading_days) not in self._rolling]
+
+            if missing:
+                surface = rolling_sharpe_surface(self.returns, missing, trading_days)
+                for w in missing:
+                    self._rolling[(w, trading_days)] = surface.xs(w, axis=1, level="window")
+
+            blocks = {w: self._rolling[(w, trading_days)] for w in windows}
+
+        surface = pd.concat(blocks, axis=1, names=["window", "metric"])
+        return surface.swaplevel(axis=1)[["mean", "volatility", "sharpe"]]
@@ -0,0 +1,123 @@
+# engine/benchmark_cache.py
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import pandas as pd
+
+from engine.data_loader import load_price_data
+from engine.returns import compute_log_returns
+
+
+class BenchmarkCache:
+    """
+    Process-wide LRU cache of benchmark prices and log returns.
+
+    Entries are keyed by (ticker, start, end). A request whose date range
+    lies inside a cached range is answered by slicing that entry, so a
+    universe run loads and transforms each benchmark once. Returned
+    series are shared between callers and must not be modified in place.
+    """
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _find(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp):
+        for key in reversed(self._entries):
+            cached_ticker, cached_start, cached_end = key
+
+            if cached_ticker == ticker and cached_start <= start and cached_end >= end:
+                return key
+
+        return None
+
+    def put(
+        self,
+        ticker: str,
+        start,
+        end,
+        prices: pd.Series
+    ) -> Tuple[pd.Series, pd.Series]:
+        """
+        Store benchmark prices for [start, end) and return (prices, returns).
+        """
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end)
+        entry = (prices, compute_log_returns(prices))
+
+        with self._lock:
+            # Drop entries the new range makes redundant
+            for key in list(self._entries):
+                if key[0] == ticker and start <= key[1] and key[2] <= end:
+                    del self._entries[key]
+
+            self._entries[(ticker, start, end)] = entry
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return entry
+
+    def get(
+        self,
+        ticker: str,
+        start,
+        end
+    ) -> Tuple[pd.Series, pd.Series]:
+        """
+        Return (prices, log returns) of a benchmark for [start, end).
+        """
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end)
+
+        with self._lock:
+            key = self._find(ticker, start, end)
+
+            if key is None:
+                prices = load_price_data(ticker=ticker, start=start, end=end)
+                return self.put(ticker, start, end, prices)
+
+            self._entries.move_to_end(key)
+            prices, returns = self._entries[key]
+
+        if key[1] == start and key[2] == end:
+            return prices, returns
+
+        prices = prices[(prices.index >= start) & (prices.index < end)]
+
+        # Same values compute_log_returns would give on the sliced prices
+        if prices.empty:
+            returns = returns.iloc[:0]
+        else:
+            returns = returns[(returns.index > prices.index[0]) & (returns.index < end)]
+
+        return prices, returns
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_default_cache = BenchmarkCache()
+
+
+def get_benchmark(
+    ticker: str,
+    start,
+    end,
+    cache: Optional[BenchmarkCache] = None
+) -> Tuple[pd.Series, pd.Series]:
+    """
+    Load benchmark prices and log returns through the shared cache.
+    """
+    return (cache or _default_cache).get(ticker, start, end)
+
+
+def get_benchmark_cache() -> BenchmarkCache:
+    """
+    Return the process-wide benchmark cache.
+    """
+    return _default_cache
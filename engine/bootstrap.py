@@ -0,0 +1,172 @@
+# engine/bootstrap.py
+
+import warnings
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import skew
+
+from engine.parallel import run_seeded_batches
+
+
+def stationary_bootstrap_indices(
+    n: int,
+    n_samples: int,
+    mean_block: float,
+    rng: np.random.Generator,
+    length: int = None
+) -> np.ndarray:
+    """
+    Index matrix (length x n_samples) of the stationary bootstrap (Politis
+    & Romano 1994) over a series of n values: each column is one resample
+    made of blocks with geometric lengths (mean mean_block) starting at
+    uniform positions, wrapping around the end of the series.
+    length defaults to n.
+    """
+    length = n if length is None else length
+    rows = np.arange(length)[:, None]
+
+    new_block = rng.random((length, n_samples)) < 1 / mean_block
+    new_block[0] = True
+    starts = rng.integers(0, n, size=(length, n_samples))
+
+    # Row at which the block covering each position began
+    block_row = np.maximum.accumulate(np.where(new_block, rows, 0), axis=0)
+    block_start = np.take_along_axis(starts, block_row, axis=0)
+
+    return (block_start + rows - block_row) % n
+
+
+# -------------------------
+# Column-wise metrics on an (n x samples) return matrix
+# -------------------------
+
+def _sharpe(R: np.ndarray, trading_days: int, confidence_level: float) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return R.mean(axis=0) * trading_days / (R.std(axis=0, ddof=1) * np.sqrt(trading_days))
+
+
+def _sortino(R: np.ndarray, trading_days: int, confidence_level: float) -> np.ndarray:
+    # Sample std of the negative returns per column; NaN with fewer than 2
+    downside = R < 0
+    count = downside.sum(axis=0)
+    enough = count >= 2
+
+    safe_count = np.maximum(count, 1)
+    mean = np.where(downside, R, 0.0).sum(axis=0) / safe_count
+    squares = np.where(downside, (R - mean) ** 2, 0.0).sum(axis=0)
+    down_vol = np.where(enough, np.sqrt(squares / np.maximum(count - 1, 1)), np.nan) * np.sqrt(trading_days)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return R.mean(axis=0) * trading_days / down_vol
+
+
+def _value_at_risk(R: np.ndarray, trading_days: int, confidence_level: float) -> np.ndarray:
+    return np.percentile(R, (1 - confidence_level) * 100, axis=0)
+
+
+def _conditional_value_at_risk(R: np.ndarray, trading_days: int, confidence_level: float) -> np.ndarray:
+    tail = R <= _value_at_risk(R, trading_days, confidence_level)
+    return (R * tail).sum(axis=0) / tail.sum(axis=0)
+
+
+def _skewness(R: np.ndarray, trading_days: int, confidence_level: float) -> np.ndarray:
+    # Constant resamples (common for short series) have no skew; scipy warns
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return skew(R, axis=0)
+
+
+BOOTSTRAP_METRICS = {
+    "sharpe_ratio": _sharpe,
+    "sortino_ratio": _sortino,
+    "value_at_risk": _value_at_risk,
+    "conditional_value_at_risk": _conditional_value_at_risk,
+    "skewness": _skewness
+}
+
+
+def _bootstrap_batch(
+    n_samples: int,
+    seed: np.random.SeedSequence,
+    values: np.ndarray,
+    mean_block: float,
+    metrics: Sequence[str],
+    trading_days: int,
+    confidence_level: float
+) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    R = values[stationary_bootstrap_indices(len(values), n_samples, mean_block, rng)]
+
+    return {
+        name: BOOTSTRAP_METRICS[name](R, trading_days, confidence_level)
+        for name in metrics
+    }
+
+
+def bootstrap_metrics(
+    returns: pd.Series,
+    metrics: Sequence[str] = tuple(BOOTSTRAP_METRICS),
+    n_samples: int = 1000,
+    mean_block: Optional[float] = None,
+    batch_size: int = 250,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    trading_days: int = 252,
+    confidence_level: float = 0.95
+) -> Dict[str, np.ndarray]:
+    """
+    Bootstrap distribution of each metric (one value per resample).
+
+    Resamples are drawn in batches of batch_size as index matrices and the
+    metrics are evaluated column-wise. Batches are seeded and fanned out
+    by engine.parallel.run_seeded_batches, so results depend on seed only,
+    not on workers (> 1 uses a process pool).
+
+    mean_block defaults to n ** (1/3), a common block length for daily returns.
+    """
+    values = returns.dropna().to_numpy(dtype=np.float64)
+
+    if len(values) < 2:
+        raise ValueError("Return series is too short to bootstrap")
+
+    unknown = set(metrics) - set(BOOTSTRAP_METRICS)
+    if unknown:
+        raise ValueError(f"Unknown bootstrap metrics: {sorted(unknown)}")
+
+    mean_block = mean_block or max(1.0, len(values) ** (1 / 3))
+
+    return run_seeded_batches(
+        _bootstrap_batch,
+        n_samples,
+        batch_size,
+        seed,
+        (values, mean_block, list(metrics), trading_days, confidence_level),
+        workers
+    )
+
+
+def bootstrap_confidence_intervals(
+    returns: pd.Series,
+    metrics: Sequence[str] = tuple(BOOTSTRAP_METRICS),
+    ci_level: float = 0.95,
+    **kwargs
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Percentile bootstrap confidence interval (lower, upper) for each metric.
+    Keyword arguments are passed to bootstrap_metrics.
+    """
+    samples = bootstrap_metrics(returns, metrics, **kwargs)
+    tail = (1 - ci_level) / 2 * 100
+
+    intervals = {}
+    for name, values in samples.items():
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            intervals[name] = (np.nan, np.nan)
+        else:
+            lower, upper = np.percentile(values, [tail, 100 - tail])
+            intervals[name] = (lower, upper)
+
+    return intervals
@@ -1,40 +1,185 @@
-import yfinance as yf
+import warnings
+from collections import defaultdict
+
+import numpy as np
 import pandas as pd
-from typing import Tuple
+from typing import List, Tuple
+
+from engine.price_providers import get_price_provider
+from engine.price_store import (
+    get_ticker_metadata,
+    missing_ranges,
+    read_prices,
+    write_prices
+)
+
 
+# An empty download for a gap this short is a weekend / holiday, not a failure
+MAX_EMPTY_GAP = pd.Timedelta(days=5)
 
-def get_available_date_range(ticker: str) -> Tuple[pd.Timestamp, pd.Timestamp]:
+
+def get_available_date_range(
+    ticker: str,
+    max_age: pd.Timedelta = pd.Timedelta(days=1),
+    provider=None
+) -> Tuple[pd.Timestamp, pd.Timestamp]:
     """
-    Fetch the full available date range for a given ticker from Yahoo Finance.
+    Return the full available date range for a given ticker.
+
+    Answered from the price store index once the full history is stored.
+    The first call downloads the history once; entries older than max_age
+    are brought up to date by fetching only the bars after the last one.
     """
-    data = yf.download(
-        ticker,
-        period="max",
-        progress=False
-    )
+    provider = provider or get_price_provider()
+    metadata = get_ticker_metadata(ticker)
+
+    if metadata is None or not metadata["full_history"]:
+        fetched = provider.fetch([ticker])
+        prices = fetched[ticker].dropna() if ticker in fetched.columns else None
+
+        if prices is None or prices.empty:
+            raise ValueError("No data found for this ticker.")
+
+        today = pd.Timestamp.today().normalize()
+        covered_end = min(prices.index[-1].normalize() + pd.Timedelta(days=1), today)
+        write_prices(ticker, prices, prices.index[0].normalize(), covered_end, full_history=True)
+
+    elif pd.Timestamp.now() - metadata["refreshed_at"] > max_age:
+        _sync_price_store(
+            [ticker],
+            metadata["covered_end"],
+            pd.Timestamp.today().normalize() + pd.Timedelta(days=1),
+            provider
+        )
 
-    if data.empty:
+    metadata = get_ticker_metadata(ticker)
+
+    if metadata["first_date"] is None:
         raise ValueError("No data found for this ticker.")
 
-    start_date = data.index.min()
-    end_date = data.index.max()
+    return metadata["first_date"], metadata["last_date"]
+
+
+def _sync_price_store(
+    tickers: List[str],
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    provider
+):
+    """
+    Fetch only the date ranges the local store is missing and append them.
+
+    Tickers missing the same range are fetched together in one request.
+    """
+    # Bars after today do not exist yet; today's bar is refetched until it closes
+    today = pd.Timestamp.today().normalize()
+    end = min(end, today + pd.Timedelta(days=1))
+
+    gaps = defaultdict(list)
+    for ticker in tickers:
+        for gap in missing_ranges(ticker, start, end):
+            gaps[gap].append(ticker)
+
+    for (gap_start, gap_end), group in gaps.items():
+        try:
+            fetched = provider.fetch(group, gap_start, gap_end)
+        except Exception as e:
+            warnings.warn(f"Could not fetch {group} {gap_start.date()} → {gap_end.date()}: {e}")
+            continue
+
+        for ticker in group:
+            prices = (
+                fetched[ticker].dropna()
+                if ticker in fetched.columns
+                else pd.Series(dtype=float, index=pd.DatetimeIndex([]))
+            )
 
-    return start_date, end_date
+            if prices.empty:
+                if gap_end - gap_start <= MAX_EMPTY_GAP and gap_end <= today:
+                    write_prices(ticker, prices, gap_start, gap_end)
+                continue
 
+            write_prices(ticker, prices, gap_start, min(gap_end, today))
 
-def load_price_data(ticker: str, start: str, end: str) -> pd.Series:
+
+def load_price_data(
+    ticker: str,
+    start: str,
+    end: str,
+    use_store: bool = True,
+    provider=None
+) -> pd.Series:
     """
     Load adjusted (auto-adjusted) close prices for a given ticker and date range.
+
+    Prices are served from the local price store; only date ranges that
+    are not stored yet are downloaded. Set use_store=False to bypass it.
     """
-    data = yf.download(
-        ticker,
-        start=start,
-        end=end,
-        progress=False
-    )
+    provider = provider or get_price_provider()
+    start = pd.Timestamp(start)
+    end = pd.Timestamp(end)
 
-    if data.empty:
+    if not use_store:
+        fetched = provider.fetch([ticker], start, end)
+        prices = fetched[ticker].dropna() if ticker in fetched.columns else None
+    else:
+        _sync_price_store([ticker], start, end, provider)
+        prices = read_prices(ticker, start, end)
+
+    if prices is None or prices.empty:
         raise ValueError("No data fetched. Check date range.")
 
-    prices = data["Close"].dropna().squeeze()
     return prices
+
+
+def load_price_panel(
+    tickers: List[str],
+    start: str,
+    end: str,
+    use_store: bool = True,
+    provider=None
+) -> pd.DataFrame:
+    """
+    Load close prices for many tickers as one aligned frame (dates x tickers).
+
+    Missing ranges are fetched in batched requests. The frame is backed by a
+    single contiguous float64 array; dates a ticker did not trade are NaN.
+    """
+    provider = provider or get_price_provider()
+    tickers = list(dict.fromkeys(tickers))
+    start = pd.Timestamp(start)
+    end = pd.Timestamp(end)
+
+    if use_store:
+        _sync_price_store(tickers, start, end, provider)
+        series = {ticker: read_prices(ticker, start, end) for ticker in tickers}
+    else:
+        fetched = provider.fetch(tickers, start, end)
+        series = {
+            ticker: fetched[ticker].dropna() if ticker in fetched.columns else None
+            for ticker in tickers
+        }
+
+    missing = [t for t, s in series.items() if s is None or s.empty]
+
+    if len(missing) == len(tickers):
+        raise ValueError("No data fetched. Check tickers and date range.")
+
+    if missing:
+        warnings.warn(f"No price data for: {', '.join(missing)}")
+
+    loaded = [s for s in series.values() if s is not None and not s.empty]
+    dates = pd.DatetimeIndex(
+        np.unique(np.concatenate([s.index.values for s in loaded])),
+        name="Date"
+    )
+
+    values = np.full((len(dates), len(tickers)), np.nan)
+
+    for j, ticker in enumerate(tickers):
+        prices = series[ticker]
+
+        if prices is not None and not prices.empty:
+            values[dates.get_indexer(prices.index), j] = prices.values
+
+    return pd.DataFrame(values, index=dates, columns=tickers, copy=False)
@@ -1,82 +1,143 @@
 # engine/drawdown_events.py
 
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from typing import Dict, Tuple
 
 
-def extract_drawdown_events(prices: pd.Series) -> List[Dict]:
+EVENT_COLUMNS = [
+    "peak_date",
+    "trough_date",
+    "recovery_date",
+    "drawdown_pct",
+    "drawdown_duration_days",
+    "recovery_time_days"
+]
+
+
+def find_drawdown_episodes(
+    values: np.ndarray,
+    peaks: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Extract drawdown and recovery episodes from a price series.
+    Locate drawdown episodes from run boundaries of the underwater mask.
 
-    Each episode contains:
-    - peak_date
-    - trough_date
-    - recovery_date (None if ongoing)
-    - drawdown_pct
-    - drawdown_duration (days) 
-    - recovery_time (days or None)
+    Returns (peak_idx, trough_idx, end_idx) per episode; end_idx is the
+    recovery bar, or len(values) while the episode is ongoing.
     """
+    underwater = values < peaks
 
-    events = []
+    # Underwater runs are [starts[k], ends[k])
+    edges = np.diff(underwater.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
 
-    peak_price = prices.iloc[0]
-    peak_date = prices.index[0]
+    if len(starts) == 0:
+        return starts, starts, ends
 
-    trough_price = peak_price
-    trough_date = peak_date
+    # Trough is the first occurrence of the lowest close within each run
+    bounds = np.empty(2 * len(starts), dtype=np.int64)
+    bounds[0::2] = starts
+    bounds[1::2] = ends
+    run_min = np.minimum.reduceat(np.append(values, np.inf), bounds)[0::2]
 
-    in_drawdown = False
+    run_id = np.cumsum(edges[:-1] == 1) - 1
+    at_min = np.flatnonzero(underwater & (values == run_min[np.maximum(run_id, 0)]))
+    first_at_min = np.r_[True, run_id[at_min][1:] != run_id[at_min][:-1]]
 
-    for date, price in prices.items():
+    # The peak is the last close at the running high before each run
+    return starts - 1, at_min[first_at_min], ends
 
-        # New peak → recovery or reset
-        if price >= peak_price:
 
-            if in_drawdown:
-                events.append({
-                    "peak_date": peak_date,
-                    "trough_date": trough_date,
-                    "recovery_date": date,
-                    "drawdown_pct": (trough_price - peak_price) / peak_price,
-                    "drawdown_duration_days": (trough_date - peak_date).days,
-                    "recovery_time_days": (date - trough_date).days
-                })
-                in_drawdown = False
+def build_drawdown_events(
+    peak_dates: np.ndarray,
+    trough_dates: np.ndarray,
+    recovery_dates: np.ndarray,
+    peak_prices: np.ndarray,
+    trough_prices: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Assemble event columns from per-episode dates and prices.
+    recovery_dates holds NaT for the ongoing episode.
+    """
+    if len(peak_dates) == 0:
+        return {column: np.empty(0) for column in EVENT_COLUMNS}
+
+    one_day = np.timedelta64(1, "D")
+    recovered = ~np.isnat(recovery_dates)
+    recovery_days = (recovery_dates[recovered] - trough_dates[recovered]) // one_day
+
+    # Same dtypes pandas infers for the per-episode records: int days when
+    # every episode recovered, float with NaN for a mix, None when none did
+    if recovered.all():
+        recovery_time = recovery_days.astype(np.int64)
+    elif recovered.any():
+        recovery_time = np.full(len(peak_dates), np.nan)
+        recovery_time[recovered] = recovery_days
+    else:
+        recovery_dates = np.full(len(peak_dates), None, dtype=object)
+        recovery_time = np.full(len(peak_dates), None, dtype=object)
+
+    return {
+        "peak_date": peak_dates,
+        "trough_date": trough_dates,
+        "recovery_date": recovery_dates,
+        "drawdown_pct": (trough_prices - peak_prices) / peak_prices,
+        "drawdown_duration_days": ((trough_dates - peak_dates) // one_day).astype(np.int64),
+        "recovery_time_days": recovery_time
+    }
+
+
+def extract_drawdown_events(
+    prices: pd.Series,
+    cumulative_max: pd.Series = None
+) -> Dict[str, np.ndarray]:
+    """
+    Extract drawdown and recovery episodes from a price series.
+
+    Returns one array per column, one row per episode:
+    - peak_date
+    - trough_date
+    - recovery_date (missing if ongoing)
+    - drawdown_pct
+    - drawdown_duration_days
+    - recovery_time_days (missing if ongoing)
 
-            peak_price = price
-            peak_date = date
-            trough_price = price
-            trough_date = date
+    An episode starts on the first close below the running peak and
+    recovers on the first close back at or above that peak. Episodes are
+    found from run boundaries of the underwater mask, without a Python loop.
+    """
+    values = prices.to_numpy(dtype=np.float64)
+    dates = prices.index.to_numpy()
 
-        else:
-            # Still underwater
-            in_drawdown = True
+    if cumulative_max is None:
+        peaks = np.maximum.accumulate(values)
+    else:
+        peaks = cumulative_max.to_numpy(dtype=np.float64)
 
-            if price < trough_price:
-                trough_price = price
-                trough_date = date
+    peak_idx, trough_idx, end_idx = find_drawdown_episodes(values, peaks)
 
-    # Handle ongoing drawdown
-    if in_drawdown:
-        events.append({
-            "peak_date": peak_date,
-            "trough_date": trough_date,
-            "recovery_date": None,
-            "drawdown_pct": (trough_price - peak_price) / peak_price,
-            "drawdown_duration_days": (trough_date - peak_date).days,
-            "recovery_time_days": None
-        })
+    recovered = end_idx < len(values)
+    recovery_dates = np.full(len(end_idx), np.datetime64("NaT"), dtype=dates.dtype)
+    recovery_dates[recovered] = dates[end_idx[recovered]]
 
-    return events
+    return build_drawdown_events(
+        dates[peak_idx],
+        dates[trough_idx],
+        recovery_dates,
+        values[peak_idx],
+        values[trough_idx]
+    )
 
 
-def drawdown_events_df(prices: pd.Series) -> pd.DataFrame:
+def drawdown_events_df(
+    prices: pd.Series,
+    cumulative_max: pd.Series = None
+) -> pd.DataFrame:
     """
     Return drawdown events as a DataFrame.
     """
-    df = pd.DataFrame(extract_drawdown_events(prices))
-
-    if not df.empty:
-        df["drawdown_pct"] = df["drawdown_pct"] * 100
+    events = extract_drawdown_events(prices, cumulative_max)
+    events["drawdown_pct"] *= 100
 
-    return df
+    return pd.DataFrame(events, columns=EVENT_COLUMNS, copy=False)
@@ -0,0 +1,124 @@
+# engine/factors.py
+
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Folder of factor sets: {FACTOR_DIR}/{factor_set}.csv (override with env var)
+FACTOR_DIR = os.environ.get("FACTOR_DIR", "factors")
+
+
+def load_factor_returns(
+    factor_set: str,
+    start=None,
+    end=None,
+    factor_dir: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Load a factor set from a local CSV: Date index, one column of daily
+    (decimal) returns per factor. Rows in [start, end) are kept.
+    """
+    path = os.path.join(factor_dir or FACTOR_DIR, f"{factor_set}.csv")
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Factor set not found: {path}")
+
+    factors = pd.read_csv(path, index_col=0, parse_dates=True).astype(float).sort_index()
+    factors.index.name = "Date"
+
+    if start is not None:
+        factors = factors[factors.index >= pd.Timestamp(start)]
+    if end is not None:
+        factors = factors[factors.index < pd.Timestamp(end)]
+
+    return factors
+
+
+def _solve_group(X: np.ndarray, Y: np.ndarray) -> tuple:
+    """
+    Least squares of every column of Y on X through one QR factorization.
+    Returns (coefficients, standard errors, R²), one column per target.
+    """
+    n, p = X.shape
+    Q, R = np.linalg.qr(X)
+
+    coefficients = np.linalg.solve(R, Q.T @ Y)
+    residuals = Y - X @ coefficients
+    rss = np.einsum("ij,ij->j", residuals, residuals)
+
+    centered = Y - Y.mean(axis=0)
+    tss = np.einsum("ij,ij->j", centered, centered)
+
+    # diag((X'X)^-1) = squared row norms of R^-1
+    R_inv = np.linalg.solve(R, np.eye(p))
+    sigma2 = rss / (n - p) if n > p else np.full(Y.shape[1], np.nan)
+    std_errors = np.sqrt(np.outer((R_inv ** 2).sum(axis=1), sigma2))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r_squared = np.where(tss > 0, 1 - rss / tss, np.nan)
+
+    return coefficients, std_errors, r_squared
+
+
+def factor_regression(
+    stock_returns: pd.DataFrame,
+    factor_returns: pd.DataFrame,
+    trading_days: int = 252
+) -> dict:
+    """
+    Regress every stock (column) on the same factor matrix plus an intercept.
+
+    Factor rows with missing values are dropped. Stocks sharing the same
+    missing-data pattern share one QR factorization of the factor matrix,
+    so a universe with complete histories is solved with a single one.
+
+    Returns DataFrames indexed by ticker:
+    - loadings: Alpha (annualized intercept) and one beta per factor
+    - t_stats: t-statistics of the same coefficients
+    and Series r_squared and observations.
+    """
+    if isinstance(stock_returns, pd.Series):
+        stock_returns = stock_returns.to_frame()
+
+    factors = factor_returns.dropna()
+    targets = stock_returns.reindex(factors.index)
+
+    X = np.column_stack([np.ones(len(factors)), factors.to_numpy(dtype=np.float64)])
+    Y = targets.to_numpy(dtype=np.float64)
+    present = ~np.isnan(Y)
+
+    columns = ["Alpha"] + list(factors.columns)
+    coefficients = np.full((Y.shape[1], X.shape[1]), np.nan)
+    std_errors = np.full_like(coefficients, np.nan)
+    r_squared = np.full(Y.shape[1], np.nan)
+    observations = present.sum(axis=0)
+
+    # Group targets by their missing-data pattern
+    patterns, group = np.unique(present.T, axis=0, return_inverse=True)
+
+    for g, rows in enumerate(patterns):
+        members = np.flatnonzero(group.ravel() == g)
+
+        if rows.sum() <= X.shape[1] - 1:
+            continue
+
+        coef, se, r2 = _solve_group(X[rows], Y[np.ix_(rows, members)])
+        coefficients[members] = coef.T
+        std_errors[members] = se.T
+        r_squared[members] = r2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_stats = coefficients / std_errors
+
+    coefficients[:, 0] *= trading_days
+    index = pd.Index(stock_returns.columns, name="ticker")
+
+    return {
+        "loadings": pd.DataFrame(coefficients, index=index, columns=columns),
+        "t_stats": pd.DataFrame(t_stats, index=index, columns=columns),
+        "r_squared": pd.Series(r_squared, index=index, name="R2"),
+        "observations": pd.Series(observations, index=index, name="Observations")
+    }
@@ -0,0 +1,73 @@
+# engine/holding_period.py
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from engine.range_query import DrawdownSparseTable
+
+
+# 1M, 3M, 6M, 1Y, 2Y, 3Y and 5Y in trading days
+DEFAULT_HOLDING_PERIODS = (21, 63, 126, 252, 504, 756, 1260)
+
+
+def holding_period_matrix(
+    prices: pd.Series,
+    holding_periods: Optional[Sequence[int]] = DEFAULT_HOLDING_PERIODS
+) -> Dict[str, pd.DataFrame]:
+    """
+    Total return, CAGR and max drawdown for every start date and holding
+    period (in trading days), as if bought at the close on the start date
+    and sold holding_period bars later.
+
+    Returns one DataFrame per metric (rows = start dates, columns =
+    holding periods; NaN where the sale date is past the end of the data).
+    Max drawdown comes from a sparse table, so every cell is O(1) after
+    O(n log n) preprocessing. Cells equal engine.growth.total_return and
+    engine.risk.max_drawdown on the same slice, and engine.growth.cagr up
+    to the last bit of the vectorized power.
+
+    holding_periods=None builds the full matrix (every period from 1 to
+    n - 1). That is n x (n - 1) floats per metric, about 200 MB each for
+    20 years of daily bars, so the default keeps the usual horizons.
+    Single (start, end) questions are better answered by
+    engine.range_query.PriceRangeIndex without building a matrix.
+    """
+    if prices.empty:
+        raise ValueError("Price series is empty")
+
+    values = prices.to_numpy(dtype=np.float64)
+    days = (prices.index - prices.index[0]).days.to_numpy()
+    n = len(values)
+    periods = list(range(1, n)) if holding_periods is None else list(holding_periods)
+
+    total_return = np.full((n, len(periods)), np.nan)
+    cagr = np.full_like(total_return, np.nan)
+    max_dd = np.full_like(total_return, np.nan)
+
+    drawdowns = DrawdownSparseTable(values)
+
+    for j, period in enumerate(periods):
+        if period < 1 or period >= n:
+            continue
+
+        start = np.arange(n - period)
+        end = start + period
+        ratio = values[end] / values[start]
+
+        total_return[start, j] = ratio - 1
+
+        num_years = (days[end] - days[start]) / 365.25
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cagr[start, j] = np.where(num_years > 0, ratio ** (1 / num_years) - 1, np.nan)
+
+        max_dd[start, j] = drawdowns.query(start, end)
+
+    columns = pd.Index(periods, name="holding_period_days")
+
+    return {
+        "total_return": pd.DataFrame(total_return, index=prices.index, columns=columns),
+        "cagr": pd.DataFrame(cagr, index=prices.index, columns=columns),
+        "max_drawdown": pd.DataFrame(max_dd, index=prices.index, columns=columns)
+    }
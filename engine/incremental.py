@@ -0,0 +1,532 @@
+# engine/incremental.py
+
+import numpy as np
+import pandas as pd
+
+from engine.drawdown_events import (
+    EVENT_COLUMNS,
+    find_drawdown_episodes,
+    build_drawdown_events
+)
+from engine.stability import rolling_sharpe
+from engine.tail_risk import _percentile_from_sorted
+
+
+class _State:
+    """
+    Base for running states: plain attributes that round-trip through a dict
+    (and therefore through the analysis cache).
+    """
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, state: dict):
+        obj = cls.__new__(cls)
+        obj.__dict__.update(state)
+        return obj
+
+
+class MomentState(_State):
+    """
+    Count, mean and central moment sums (M2, M3, M4) of a sample.
+    Chunks are merged with the pairwise update of Pébay (2008).
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+
+    def update(self, values: np.ndarray):
+        """Fold a chunk of observations into the running moments."""
+        nb = len(values)
+        if nb == 0:
+            return
+
+        mean_b = values.mean()
+        d = values - mean_b
+        d2 = d * d
+        m2_b = d2.sum()
+        m3_b = (d2 * d).sum()
+        m4_b = (d2 * d2).sum()
+
+        na = self.n
+        if na == 0:
+            self.n, self.mean, self.m2, self.m3, self.m4 = nb, mean_b, m2_b, m3_b, m4_b
+            return
+
+        n = na + nb
+        delta = mean_b - self.mean
+        m2_a, m3_a = self.m2, self.m3
+
+        self.m4 += (
+            m4_b
+            + delta ** 4 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+            + 6 * delta ** 2 * (na * na * m2_b + nb * nb * m2_a) / n ** 2
+            + 4 * delta * (na * m3_b - nb * m3_a) / n
+        )
+        self.m3 += (
+            m3_b
+            + delta ** 3 * na * nb * (na - nb) / n ** 2
+            + 3 * delta * (na * m2_b - nb * m2_a) / n
+        )
+        self.m2 += m2_b + delta ** 2 * na * nb / n
+        self.mean += delta * nb / n
+        self.n = n
+
+    def add(self, x: float):
+        """Fold a single observation (Welford / Terriberry update)."""
+        n1 = self.n
+        self.n = n = n1 + 1
+
+        delta = x - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+
+        self.mean += delta_n
+        self.m4 += term1 * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * self.m2 - 4 * delta_n * self.m3
+        self.m3 += term1 * delta_n * (n - 2) - 3 * delta_n * self.m2
+        self.m2 += term1
+
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1, as pandas)."""
+        if self.n < 2:
+            return np.nan
+        return np.sqrt(self.m2 / (self.n - 1))
+
+    def skew(self) -> float:
+        """Biased sample skewness (as scipy.stats.skew)."""
+        if self.m2 == 0:
+            return np.nan
+        return np.sqrt(self.n) * self.m3 / self.m2 ** 1.5
+
+    def kurtosis(self) -> float:
+        """Biased excess kurtosis (as scipy.stats.kurtosis)."""
+        if self.m2 == 0:
+            return np.nan
+        return self.n * self.m4 / self.m2 ** 2 - 3
+
+
+class RegressionState(_State):
+    """
+    Means and centered cross-products of (x, y) pairs for a running
+    least-squares fit of y on x.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.cxx = 0.0
+        self.cyy = 0.0
+        self.cxy = 0.0
+
+    def update(self, x: np.ndarray, y: np.ndarray):
+        """Fold a chunk of pairs into the running cross-products."""
+        nb = len(x)
+        if nb == 0:
+            return
+
+        mean_xb = x.mean()
+        mean_yb = y.mean()
+        dx = x - mean_xb
+        dy = y - mean_yb
+
+        na = self.n
+        n = na + nb
+        delta_x = mean_xb - self.mean_x
+        delta_y = mean_yb - self.mean_y
+        weight = na * nb / n
+
+        self.cxx += (dx * dx).sum() + delta_x * delta_x * weight
+        self.cyy += (dy * dy).sum() + delta_y * delta_y * weight
+        self.cxy += (dx * dy).sum() + delta_x * delta_y * weight
+        self.mean_x += delta_x * nb / n
+        self.mean_y += delta_y * nb / n
+        self.n = n
+
+    def add(self, x: float, y: float):
+        """Fold a single pair (Welford-style co-moment update)."""
+        self.n += 1
+
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.n
+        self.mean_y += dy / self.n
+
+        self.cxx += dx * (x - self.mean_x)
+        self.cyy += dy * (y - self.mean_y)
+        self.cxy += dx * (y - self.mean_y)
+
+    def fit(self) -> dict:
+        """Slope, intercept and R² (as scipy.stats.linregress)."""
+        if self.n < 2 or self.cxx == 0:
+            return {"slope": np.nan, "intercept": np.nan, "r_squared": np.nan}
+
+        slope = self.cxy / self.cxx
+        r = 0.0 if self.cyy == 0 else np.clip(self.cxy / np.sqrt(self.cxx * self.cyy), -1.0, 1.0)
+
+        return {
+            "slope": slope,
+            "intercept": self.mean_y - slope * self.mean_x,
+            "r_squared": r ** 2
+        }
+
+
+class DrawdownState(_State):
+    """
+    Running peak, open drawdown episode, underwater run lengths and the
+    closed drawdown episodes of a price series.
+    """
+
+    def __init__(self):
+        self.peak_price = np.nan
+        self.peak_date = None
+        self.in_drawdown = False
+        self.trough_price = np.nan
+        self.trough_date = None
+        self.current_run = 0
+        self.max_run = 0
+        self.max_drawdown = 0.0
+
+        self.peak_dates = None
+        self.trough_dates = None
+        self.recovery_dates = None
+        self.peak_prices = np.empty(0)
+        self.trough_prices = np.empty(0)
+
+    def update(self, values: np.ndarray, dates: np.ndarray):
+        """Fold new bars into the drawdown state."""
+        if len(values) == 0:
+            return
+
+        # Only the last peak and the open trough matter for what comes next
+        if self.peak_date is None:
+            prefix_values, prefix_dates = [], []
+            self.peak_dates = self.trough_dates = self.recovery_dates = dates[:0]
+        elif self.in_drawdown:
+            prefix_values = [self.peak_price, self.trough_price]
+            prefix_dates = [self.peak_date, self.trough_date]
+        else:
+            prefix_values, prefix_dates = [self.peak_price], [self.peak_date]
+
+        seg_values = np.concatenate([prefix_values, values])
+        seg_dates = np.concatenate([np.array(prefix_dates, dtype=dates.dtype), dates])
+        peaks = np.maximum.accumulate(seg_values)
+        underwater = seg_values < peaks
+
+        # Episodes: closed ones are recorded, the last one may stay open
+        peak_idx, trough_idx, end_idx = find_drawdown_episodes(seg_values, peaks)
+        closed = end_idx < len(seg_values)
+
+        self.peak_dates = np.concatenate([self.peak_dates, seg_dates[peak_idx[closed]]])
+        self.trough_dates = np.concatenate([self.trough_dates, seg_dates[trough_idx[closed]]])
+        self.recovery_dates = np.concatenate([self.recovery_dates, seg_dates[end_idx[closed]]])
+        self.peak_prices = np.concatenate([self.peak_prices, seg_values[peak_idx[closed]]])
+        self.trough_prices = np.concatenate([self.trough_prices, seg_values[trough_idx[closed]]])
+
+        self.in_drawdown = bool(underwater[-1])
+        if self.in_drawdown:
+            self.trough_price = seg_values[trough_idx[-1]]
+            self.trough_date = pd.Timestamp(seg_dates[trough_idx[-1]])
+
+        last_high = np.flatnonzero(~underwater)[-1]
+        self.peak_price = seg_values[last_high]
+        self.peak_date = pd.Timestamp(seg_dates[last_high])
+
+        # Underwater run lengths, continuing the run carried from before
+        new_underwater = underwater[len(prefix_values):]
+        edges = np.diff(new_underwater.astype(np.int8), prepend=np.int8(self.current_run > 0), append=0)
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+
+        if self.current_run > 0:
+            starts = np.r_[-self.current_run, starts]
+
+        run_lengths = ends - starts
+        if len(run_lengths):
+            self.max_run = max(self.max_run, int(run_lengths.max()))
+        self.current_run = int(run_lengths[-1]) if new_underwater[-1] else 0
+
+        new_peaks = peaks[len(prefix_values):]
+        self.max_drawdown = min(self.max_drawdown, ((values - new_peaks) / new_peaks).min())
+
+    def events(self) -> dict:
+        """Closed episodes plus the open one, as extract_drawdown_events returns them."""
+        peak_dates, trough_dates = self.peak_dates, self.trough_dates
+        recovery_dates = self.recovery_dates
+        peak_prices, trough_prices = self.peak_prices, self.trough_prices
+
+        if self.in_drawdown:
+            unit = np.datetime_data(peak_dates.dtype)[0]
+            peak_dates = np.r_[peak_dates, np.datetime64(self.peak_date, unit)]
+            trough_dates = np.r_[trough_dates, np.datetime64(self.trough_date, unit)]
+            recovery_dates = np.r_[recovery_dates, np.datetime64("NaT", unit)]
+            peak_prices = np.r_[peak_prices, self.peak_price]
+            trough_prices = np.r_[trough_prices, self.trough_price]
+
+        return build_drawdown_events(
+            peak_dates, trough_dates, recovery_dates, peak_prices, trough_prices
+        )
+
+
+class RollingSharpeState(_State):
+    """
+    Summary (mean / min / max) of the rolling Sharpe series, carrying only
+    the last window - 1 returns between updates.
+    """
+
+    def __init__(self, window: int = 30, trading_days: int = 252):
+        self.window = window
+        self.trading_days = trading_days
+        self.tail = np.empty(0)
+        self.count = 0
+        self.total = 0.0
+        self.min = np.nan
+        self.max = np.nan
+
+    def update(self, returns: np.ndarray):
+        """Fold new returns into the rolling Sharpe summary."""
+        if len(returns) == 0:
+            return
+
+        values = np.concatenate([self.tail, returns])
+        sharpe = rolling_sharpe(
+            pd.Series(values), self.window, self.trading_days
+        ).to_numpy()[len(self.tail):]
+        sharpe = sharpe[~np.isnan(sharpe)]
+
+        if len(sharpe):
+            self.count += len(sharpe)
+            self.total += sharpe.sum()
+            self.min = np.fmin(self.min, sharpe.min())
+            self.max = np.fmax(self.max, sharpe.max())
+
+        self.tail = values[max(len(values) - (self.window - 1), 0):]
+
+    def summary(self) -> dict:
+        return {
+            "rolling_sharpe_mean": self.total / self.count if self.count else np.nan,
+            "rolling_sharpe_min": self.min,
+            "rolling_sharpe_max": self.max
+        }
+
+
+class IncrementalAnalysis:
+    """
+    Running state of the growth, risk, risk-adjusted, tail-risk, stability,
+    drawdown-event and market metrics of one price series.
+
+    update() folds in only the bars after the last one seen, so a daily
+    refresh of an extended window costs O(new bars) for everything except
+    the VaR / CVaR percentile, which merges new returns into the sorted
+    history. metrics() matches a full recompute of the pipelines' raw
+    outputs up to floating-point summation order.
+    """
+
+    def __init__(
+        self,
+        trading_days: int = 252,
+        rolling_window: int = 30,
+        confidence_level: float = 0.95
+    ):
+        self.trading_days = trading_days
+        self.rolling_window = rolling_window
+        self.confidence_level = confidence_level
+
+        self.first_price = np.nan
+        self.first_date = None
+        self.last_price = np.nan
+        self.last_date = None
+        self.market_last_price = np.nan
+        self.market_last_date = None
+
+        self.returns = MomentState()
+        self.downside = MomentState()
+        self.sorted_returns = np.empty(0)
+        self.rolling = RollingSharpeState(rolling_window, trading_days)
+        self.drawdown = DrawdownState()
+        self.regression = RegressionState()
+
+    # -------------------------
+    # Folding new bars
+    # -------------------------
+
+    @staticmethod
+    def _new_bars(series: pd.Series, last_date, last_price):
+        """Values and dates after last_date, plus log returns from last_price."""
+        if last_date is not None:
+            series = series[series.index > last_date]
+
+        values = series.to_numpy(dtype=np.float64)
+        dates = series.index.values
+
+        if last_date is None:
+            returns = np.log(values[1:] / values[:-1])
+            return values, dates, returns, dates[1:]
+
+        returns = np.log(values / np.r_[last_price, values[:-1]])
+        return values, dates, returns, dates
+
+    def update(self, prices: pd.Series, market_prices: pd.Series = None):
+        """
+        Fold the bars of prices (and market_prices) dated after the last
+        update. Earlier bars are assumed unchanged.
+        """
+        values, dates, returns, return_dates = self._new_bars(
+            prices, self.last_date, self.last_price
+        )
+
+        if len(values) == 0:
+            return self
+
+        if self.first_date is None:
+            self.first_price = values[0]
+            self.first_date = pd.Timestamp(dates[0])
+        self.last_price = values[-1]
+        self.last_date = pd.Timestamp(dates[-1])
+
+        # Returns: moments, sorted distribution, rolling Sharpe
+        self.returns.update(returns)
+        self.downside.update(returns[returns < 0])
+
+        new_sorted = np.sort(returns)
+        self.sorted_returns = np.insert(
+            self.sorted_returns,
+            np.searchsorted(self.sorted_returns, new_sorted, side="right"),
+            new_sorted
+        )
+
+        self.rolling.update(returns)
+
+        # Drawdowns
+        self.drawdown.update(values, dates)
+
+        # Market regression on returns aligned by date
+        if market_prices is not None:
+            market_values, market_dates, market_returns, market_return_dates = self._new_bars(
+                market_prices, self.market_last_date, self.market_last_price
+            )
+
+            if len(market_values):
+                self.market_last_price = market_values[-1]
+                self.market_last_date = pd.Timestamp(market_dates[-1])
+
+            _, stock_idx, market_idx = np.intersect1d(
+                return_dates, market_return_dates, return_indices=True
+            )
+            self.regression.update(market_returns[market_idx], returns[stock_idx])
+
+        return self
+
+    # -------------------------
+    # Reading metrics
+    # -------------------------
+
+    def metrics(self) -> dict:
+        """
+        Current metrics, keyed like the raw outputs of each pipeline, plus
+        the drawdown events table.
+        """
+        if self.returns.n == 0:
+            raise ValueError("At least two prices are needed")
+
+        trading_days = self.trading_days
+        annual_return = self.returns.mean * trading_days
+
+        vol = self.returns.std() * np.sqrt(trading_days)
+        down_vol = self.downside.std() * np.sqrt(trading_days) if self.downside.n else 0.0
+
+        total_return = self.last_price / self.first_price - 1
+        num_years = (self.last_date - self.first_date).days / 365.25
+
+        # Same guard as engine.growth.cagr
+        if num_years <= 0:
+            raise ValueError("Date range too short for CAGR calculation")
+
+        cagr = (self.last_price / self.first_price) ** (1 / num_years) - 1
+        mdd = self.drawdown.max_drawdown
+
+        var = _percentile_from_sorted(self.sorted_returns, (1 - self.confidence_level) * 100)
+        tail_size = np.searchsorted(self.sorted_returns, var, side="right")
+        cvar = self.sorted_returns[:tail_size].mean()
+
+        events = self.drawdown.events()
+        if len(events["drawdown_pct"]) == 0:
+            recovery_days = 0
+        else:
+            worst = np.argmin(events["drawdown_pct"])
+            recovery_days = events["recovery_time_days"][worst]
+            recovery_days = -1 if recovery_days is None or np.isnan(recovery_days) else int(recovery_days)
+
+        events["drawdown_pct"] = events["drawdown_pct"] * 100
+        fit = self.regression.fit()
+
+        return {
+            "growth": {
+                "total_return": total_return,
+                "cagr": cagr
+            },
+            "risk": {
+                "annualized_volatility": vol,
+                "downside_volatility": down_vol,
+                "max_drawdown": mdd,
+                "rolling_window_days": self.rolling_window
+            },
+            "risk_adjusted": {
+                "sharpe_ratio": annual_return / vol if vol != 0 else np.nan,
+                "sortino_ratio": annual_return / down_vol if down_vol != 0 else np.nan,
+                "calmar_ratio": cagr / abs(mdd) if mdd != 0 else np.nan,
+                "rolling_window_days": self.rolling_window
+            },
+            "tail_risk": {
+                "skewness": self.returns.skew(),
+                "kurtosis_excess": self.returns.kurtosis(),
+                "value_at_risk": var,
+                "conditional_value_at_risk": cvar,
+                "confidence_level": self.confidence_level
+            },
+            "market_sensitivity": {
+                "beta": fit["slope"],
+                "alpha_annual": fit["intercept"] * trading_days,
+                "r_squared": fit["r_squared"]
+            },
+            "stability": {
+                "max_drawdown_duration_days": self.drawdown.max_run,
+                "recovery_time_days": recovery_days,
+                "rolling_window_days": self.rolling_window,
+                **self.rolling.summary()
+            },
+            "drawdown_events": pd.DataFrame(events, columns=EVENT_COLUMNS, copy=False)
+        }
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+
+    _STATES = {
+        "returns": MomentState,
+        "downside": MomentState,
+        "rolling": RollingSharpeState,
+        "drawdown": DrawdownState,
+        "regression": RegressionState
+    }
+
+    def to_dict(self) -> dict:
+        state = dict(vars(self))
+        for name in self._STATES:
+            state[name] = state[name].to_dict()
+        return state
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "IncrementalAnalysis":
+        obj = cls.__new__(cls)
+        obj.__dict__.update(state)
+        for name, state_cls in cls._STATES.items():
+            setattr(obj, name, state_cls.from_dict(state[name]))
+        return obj
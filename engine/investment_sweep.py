@@ -0,0 +1,117 @@
+# engine/investment_sweep.py
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from engine.portfolio_simulator import _period_starts
+
+
+def investment_sweep(
+    prices: pd.Series,
+    initial_capitals: Sequence[float],
+    start_dates: Optional[Sequence] = None,
+    contributions: Sequence[float] = (0.0,),
+    contribution_frequencies: Sequence[str] = ("M",),
+    transaction_cost: float = 0.0
+) -> pd.DataFrame:
+    """
+    Evaluate a grid of single-asset investment scenarios in one pass.
+
+    The grid is every combination of start date, initial capital,
+    contribution amount and contribution frequency; each scenario buys at
+    the close of its start date, adds the contribution on the first
+    trading day of every later period, and holds to the end of the series.
+
+    Units held are linear in the parameters:
+
+        units_t = (C / p_s + c * U_t) / (1 + cost),  U_t = sum of 1 / p_d
+                  over contribution days s < d <= t
+
+    so the value paths of a whole (capital x contribution) grid are two
+    shared arrays broadcast against the parameter vectors, and daily P&L
+    (flows excluded) is units_{t-1} * (p_t - p_{t-1}) less contribution
+    costs. Each row has the same summary fields as simulate_portfolio.
+    """
+    if prices.empty:
+        raise ValueError("Price series is empty")
+
+    prices = prices.dropna()
+    values = prices.to_numpy(dtype=np.float64)
+    dates = prices.index
+
+    capitals = np.asarray(initial_capitals, dtype=np.float64)
+    amounts = np.asarray(contributions, dtype=np.float64)
+    cost_factor = 1 / (1 + transaction_cost)
+
+    if start_dates is None:
+        start_positions = [0]
+    else:
+        start_positions = sorted({
+            int(dates.searchsorted(pd.Timestamp(start), side="left")) for start in start_dates
+        })
+        start_positions = [s for s in start_positions if s < len(values)]
+
+    capital_grid, amount_grid = (a.ravel() for a in np.meshgrid(capitals, amounts, indexing="ij"))
+    frames = []
+
+    for frequency in contribution_frequencies:
+        period_starts = np.zeros(len(values), dtype=bool)
+        period_starts[_period_starts(dates, frequency)] = True
+
+        for s in start_positions:
+            p = values[s:]
+            contributes = period_starts[s:].copy()
+            contributes[0] = False
+
+            # Shared building blocks: value = C * A + c * B (before costs)
+            U = np.cumsum(np.where(contributes, 1 / p, 0.0))
+            A = p / p[0]
+            B = p * U
+
+            change = np.diff(p)
+            pnl_A = change / p[0]
+            pnl_B = U[:-1] * change
+
+            value = (capital_grid[:, None] * A + amount_grid[:, None] * B) * cost_factor
+            pnl = (capital_grid[:, None] * pnl_A + amount_grid[:, None] * pnl_B) * cost_factor
+            pnl -= amount_grid[:, None] * (1 - cost_factor) * contributes[1:]
+
+            rows = np.arange(len(capital_grid))
+            min_idx = value.argmin(axis=1)
+            max_idx = value.argmax(axis=1)
+
+            frame = {
+                "start_date": dates[s],
+                "initial_capital": capital_grid,
+                "contribution": amount_grid,
+                "contribution_frequency": frequency,
+                "total_contributions": amount_grid * contributes.sum(),
+                "final_value": value[:, -1],
+                "min_value": value[rows, min_idx],
+                "min_value_date": dates[s + min_idx],
+                "max_value": value[rows, max_idx],
+                "max_value_date": dates[s + max_idx]
+            }
+
+            if pnl.shape[1]:
+                gain_idx = pnl.argmax(axis=1)
+                loss_idx = pnl.argmin(axis=1)
+                frame.update({
+                    "max_daily_gain": pnl[rows, gain_idx],
+                    "max_daily_gain_date": dates[s + 1 + gain_idx],
+                    "max_daily_loss": pnl[rows, loss_idx],
+                    "max_daily_loss_date": dates[s + 1 + loss_idx]
+                })
+            else:
+                frame.update({
+                    "max_daily_gain": np.nan,
+                    "max_daily_gain_date": pd.NaT,
+                    "max_daily_loss": np.nan,
+                    "max_daily_loss_date": pd.NaT
+                })
+
+            frames.append(pd.DataFrame(frame))
+
+    return pd.concat(frames, ignore_index=True)
@@ -2,6 +2,21 @@ import numpy as np
 import pandas as pd
 from scipy.stats import linregress
 
+from engine.stability import _constant_windows
+
+
+def _align_returns(stock_returns: pd.Series, market_returns: pd.Series) -> pd.DataFrame:
+    """
+    Stock and market returns on their common dates.
+    """
+    data = pd.concat([stock_returns, market_returns], axis=1).dropna()
+    data.columns = ["stock", "market"]
+
+    if data.empty:
+        raise ValueError("No overlapping data between stock and market returns.")
+
+    return data
+
 
 def market_metrics(
     stock_returns: pd.Series,
@@ -12,12 +27,7 @@ def market_metrics(
     Compute Beta, Alpha, and R-squared using linear regression.
     """
 
-    # Align dates
-    data = pd.concat([stock_returns, market_returns], axis=1).dropna()
-    data.columns = ["stock", "market"]
-
-    if data.empty:
-        raise ValueError("No overlapping data between stock and market returns.")
+    data = _align_returns(stock_returns, market_returns)
 
     regression = linregress(data["market"], data["stock"])
 
@@ -33,3 +43,148 @@ def market_metrics(
         "Alpha": alpha_annual,
         "R2": r_squared
     }
+
+
+def _regression_frame(
+    mean_x, mean_y, var_x, var_y, cov_xy, index, trading_days: int
+) -> pd.DataFrame:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = cov_xy / var_x
+        r_squared = np.clip(cov_xy ** 2 / (var_x * var_y), 0.0, 1.0)
+
+    return pd.DataFrame(
+        {
+            "Beta": beta,
+            "Alpha": (mean_y - beta * mean_x) * trading_days,
+            "R2": r_squared
+        },
+        index=index
+    )
+
+
+def rolling_market_metrics(
+    stock_returns: pd.Series,
+    market_returns: pd.Series,
+    window: int = 60,
+    trading_days: int = 252
+) -> pd.DataFrame:
+    """
+    Rolling Beta, annualized Alpha and R-squared over a window of common dates.
+
+    Window sums of x, y, x², y² and xy come from differences of cumulative
+    sums, so every window costs O(1). Returns are centered on their full
+    sample means first to keep the cumulative sums well conditioned.
+    Windows where the market is flat have no beta (NaN).
+    """
+    data = _align_returns(stock_returns, market_returns)
+    x = data["market"].to_numpy(dtype=np.float64)
+    y = data["stock"].to_numpy(dtype=np.float64)
+
+    x_shift = x.mean()
+    y_shift = y.mean()
+    x = x - x_shift
+    y = y - y_shift
+
+    def window_mean(values: np.ndarray) -> np.ndarray:
+        sums = np.concatenate([[0.0], np.cumsum(values)])
+        out = np.full(len(values), np.nan)
+        out[window - 1:] = (sums[window:] - sums[:-window]) / window
+        return out
+
+    mean_x = window_mean(x)
+    mean_y = window_mean(y)
+
+    var_x = window_mean(x * x) - mean_x ** 2
+    var_y = window_mean(y * y) - mean_y ** 2
+    cov_xy = window_mean(x * y) - mean_x * mean_y
+
+    # Flat windows: exact zero (co)variance instead of rounding noise, so
+    # a flat market gives NaN rather than an exploding beta
+    for values, mean, var in ((x, mean_x, var_x), (y, mean_y, var_y)):
+        constant = np.zeros(len(values), dtype=bool)
+        constant[window - 1:] = _constant_windows(values, window)
+        mean[constant] = values[constant]
+        var[constant] = 0.0
+        cov_xy[constant] = 0.0
+
+    return _regression_frame(
+        mean_x + x_shift, mean_y + y_shift, var_x, var_y, cov_xy,
+        data.index, trading_days
+    )
+
+
+def ewma_market_metrics(
+    stock_returns: pd.Series,
+    market_returns: pd.Series,
+    halflife: float = 60,
+    min_periods: int = 20,
+    trading_days: int = 252
+) -> pd.DataFrame:
+    """
+    Exponentially weighted Beta, annualized Alpha and R-squared.
+    Recent days weigh more; weights halve every halflife days.
+    """
+    data = _align_returns(stock_returns, market_returns)
+    ewm = data.ewm(halflife=halflife, min_periods=min_periods)
+
+    means = ewm.mean()
+    cov = ewm.cov(bias=True)
+
+    return _regression_frame(
+        means["market"].to_numpy(),
+        means["stock"].to_numpy(),
+        cov.xs("market", level=1)["market"].to_numpy(),
+        cov.xs("stock", level=1)["stock"].to_numpy(),
+        cov.xs("market", level=1)["stock"].to_numpy(),
+        data.index,
+        trading_days
+    )
+
+
+def market_metrics_panel(
+    stock_returns_df: pd.DataFrame,
+    market_returns: pd.Series,
+    trading_days: int = 252
+) -> pd.DataFrame:
+    """
+    Beta, annualized Alpha and R-squared for every column of a return panel.
+
+    Each column is regressed on the market over the dates where both are
+    present; missing data is handled with a mask instead of per-ticker
+    dropna, so all tickers are fitted in one set of matrix operations.
+    Returns a DataFrame indexed by ticker (NaN where fewer than 2 dates overlap).
+    """
+    Y = stock_returns_df.to_numpy(dtype=np.float64)
+    x = market_returns.reindex(stock_returns_df.index).to_numpy(dtype=np.float64)
+
+    mask = ~np.isnan(Y) & ~np.isnan(x)[:, None]
+    n = mask.sum(axis=0)
+
+    X = np.where(mask, x[:, None], 0.0)
+    Y = np.where(mask, Y, 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x = X.sum(axis=0) / n
+        mean_y = Y.sum(axis=0) / n
+
+        dx = np.where(mask, X - mean_x, 0.0)
+        dy = np.where(mask, Y - mean_y, 0.0)
+
+        sxx = np.einsum("ij,ij->j", dx, dx)
+        syy = np.einsum("ij,ij->j", dy, dy)
+        sxy = np.einsum("ij,ij->j", dx, dy)
+
+        beta = sxy / sxx
+        r_squared = np.where(syy > 0, np.clip(sxy ** 2 / (sxx * syy), 0.0, 1.0), 0.0)
+
+    fitted = (n >= 2) & (sxx > 0)
+
+    return pd.DataFrame(
+        {
+            "Beta": np.where(fitted, beta, np.nan),
+            "Alpha": np.where(fitted, (mean_y - beta * mean_x) * trading_days, np.nan),
+            "R2": np.where(fitted, r_squared, np.nan),
+            "Observations": n
+        },
+        index=pd.Index(stock_returns_df.columns, name="ticker")
+    )
@@ -0,0 +1,250 @@
+# engine/metric_graph.py
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from graphlib import TopologicalSorter
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from engine.analysis_context import AnalysisContext
+from engine.benchmark_cache import get_benchmark
+from engine.drawdown_events import drawdown_events_df
+from engine.growth import total_return, cagr
+from engine.market import market_metrics
+from engine.risk import annualized_volatility, downside_volatility, max_drawdown
+from engine.risk_adjusted import sharpe_ratio, sortino_ratio, calmar_ratio
+from engine.stability import (
+    drawdown_duration,
+    max_drawdown_duration,
+    recovery_time
+)
+from engine.tail_risk import (
+    skewness,
+    kurtosis_excess,
+    value_at_risk,
+    conditional_value_at_risk
+)
+
+
+@dataclass(frozen=True)
+class MetricNode:
+    """
+    One node of the metric graph.
+
+    func is called with the values of inputs (in order) as positional
+    arguments and the listed params as keyword arguments. Intermediates
+    are shared inputs and are only returned when requested explicitly.
+    """
+    name: str
+    func: Callable
+    inputs: Tuple[str, ...] = ()
+    params: Tuple[str, ...] = ()
+    intermediate: bool = False
+
+
+# Graph sources supplied by the caller rather than computed
+SOURCES = ("prices", "context")
+
+DEFAULT_PARAMS = {
+    "trading_days": 252,
+    "risk_free_rate": 0.0,
+    "confidence_level": 0.95,
+    "rolling_window": 30,
+    "market_ticker": "^GSPC",
+    "start_date": None,
+    "end_date": None
+}
+
+METRIC_REGISTRY: Dict[str, MetricNode] = {}
+
+
+def register_metric(
+    name: str,
+    inputs: Sequence[str] = (),
+    params: Sequence[str] = (),
+    intermediate: bool = False
+):
+    """
+    Decorator adding a function to the metric graph under name.
+
+    inputs name sources or other registered nodes; the scheduler resolves
+    them, so a new metric only needs this decorator to become available
+    to compute_metrics.
+    """
+    def decorator(func: Callable) -> Callable:
+        if name in METRIC_REGISTRY or name in SOURCES:
+            raise ValueError(f"Metric already registered: {name}")
+
+        METRIC_REGISTRY[name] = MetricNode(name, func, tuple(inputs), tuple(params), intermediate)
+        return func
+
+    return decorator
+
+
+def metric_names(include_intermediates: bool = False) -> list:
+    """Registered metric names in registration order."""
+    return [
+        name for name, node in METRIC_REGISTRY.items()
+        if include_intermediates or not node.intermediate
+    ]
+
+
+def _build_graph(targets: Iterable[str], provided: Iterable[str]) -> Dict[str, Tuple[str, ...]]:
+    """Dependency graph of every node the targets need (provided values are leaves)."""
+    provided = set(provided)
+    graph = {}
+    stack = list(targets)
+
+    while stack:
+        name = stack.pop()
+
+        if name in graph or name in provided:
+            continue
+
+        if name not in METRIC_REGISTRY:
+            raise ValueError(f"Unknown metric or input: {name}")
+
+        inputs = METRIC_REGISTRY[name].inputs
+        graph[name] = tuple(i for i in inputs if i not in provided)
+        stack.extend(inputs)
+
+    return graph
+
+
+def compute_metrics(
+    prices: pd.Series,
+    metrics: Optional[Sequence[str]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    inputs: Optional[Dict[str, Any]] = None,
+    max_workers: Optional[int] = None,
+    context: Optional[AnalysisContext] = None
+) -> Dict[str, Any]:
+    """
+    Compute the requested metrics (all non-intermediate metrics if
+    omitted) by scheduling the registered graph.
+
+    Only the nodes the request depends on are evaluated, each exactly
+    once; nodes whose inputs are ready run concurrently on a thread pool
+    (max_workers=1 runs them one by one in topological order).
+
+    Shared intermediates are read from context (an AnalysisContext built
+    from prices if omitted), so values already cached by the pipelines
+    are reused. inputs → precomputed node values (e.g. market_returns)
+    that replace their nodes. params override DEFAULT_PARAMS;
+    start_date / end_date default to the span of prices.
+    """
+    if prices.empty:
+        raise ValueError("Price series is empty")
+
+    targets = list(metrics) if metrics is not None else metric_names()
+
+    settings = {**DEFAULT_PARAMS, **(params or {})}
+    settings["start_date"] = settings["start_date"] or prices.index[0]
+    settings["end_date"] = settings["end_date"] or prices.index[-1] + pd.Timedelta(days=1)
+
+    context = context or AnalysisContext(prices)
+    values = {"prices": prices, "context": context, **(inputs or {})}
+    graph = _build_graph(targets, values)
+
+    def evaluate(name: str):
+        node = METRIC_REGISTRY[name]
+        args = [values[i] for i in node.inputs]
+        kwargs = {p: settings[p] for p in node.params}
+        return node.func(*args, **kwargs)
+
+    sorter = TopologicalSorter(graph)
+
+    if max_workers == 1:
+        for name in sorter.static_order():
+            values[name] = evaluate(name)
+    else:
+        sorter.prepare()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running = {}
+
+            while sorter.is_active():
+                for name in sorter.get_ready():
+                    running[executor.submit(evaluate, name)] = name
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in finished:
+                    name = running.pop(future)
+                    values[name] = future.result()
+                    sorter.done(name)
+
+    return {name: values[name] for name in targets}
+
+
+# -------------------------
+# Shared intermediates (memoized on AnalysisContext)
+# -------------------------
+# Each node depends on the ones its context property reads, so the
+# scheduler never builds the same cached property on two threads.
+
+register_metric("returns", ["context"], intermediate=True)(lambda context: context.returns)
+register_metric(
+    "downside_returns", ["context", "returns"], intermediate=True
+)(lambda context, returns: context.downside_returns)
+register_metric(
+    "sorted_returns", ["context", "returns"], intermediate=True
+)(lambda context, returns: context.sorted_returns)
+register_metric("cumulative_max", ["context"], intermediate=True)(lambda context: context.cumulative_max)
+register_metric(
+    "drawdown", ["context", "cumulative_max"], intermediate=True
+)(lambda context, cumulative_max: context.drawdown)
+
+
+@register_metric("market_returns", params=["market_ticker", "start_date", "end_date"], intermediate=True)
+def _market_returns(market_ticker: str, start_date, end_date) -> pd.Series:
+    _, returns = get_benchmark(market_ticker, start_date, end_date)
+    return returns
+
+
+register_metric("market_stats", ["returns", "market_returns"], ["trading_days"], intermediate=True)(market_metrics)
+
+
+# -------------------------
+# Metrics
+# -------------------------
+
+register_metric("total_return", ["prices"])(total_return)
+register_metric("cagr", ["prices"])(cagr)
+
+register_metric("annualized_volatility", ["returns"], ["trading_days"])(annualized_volatility)
+register_metric(
+    "downside_volatility", ["returns", "downside_returns"], ["trading_days"]
+)(lambda returns, downside, trading_days: downside_volatility(returns, trading_days, downside))
+register_metric("max_drawdown", ["prices", "drawdown"])(max_drawdown)
+
+register_metric("sharpe_ratio", ["returns"], ["risk_free_rate", "trading_days"])(sharpe_ratio)
+register_metric(
+    "sortino_ratio", ["returns", "downside_returns"], ["risk_free_rate", "trading_days"]
+)(lambda returns, downside, **kwargs: sortino_ratio(returns, downside_returns=downside, **kwargs))
+register_metric("calmar_ratio", ["prices", "drawdown"])(calmar_ratio)
+
+register_metric("skewness", ["returns"])(skewness)
+register_metric("kurtosis_excess", ["returns"])(kurtosis_excess)
+register_metric(
+    "value_at_risk", ["returns", "sorted_returns"], ["confidence_level"]
+)(lambda returns, ordered, confidence_level: value_at_risk(returns, confidence_level, ordered))
+register_metric(
+    "conditional_value_at_risk", ["returns", "sorted_returns"], ["confidence_level"]
+)(lambda returns, ordered, confidence_level: conditional_value_at_risk(returns, confidence_level, ordered))
+
+register_metric("beta", ["market_stats"])(lambda stats: stats["Beta"])
+register_metric("alpha", ["market_stats"])(lambda stats: stats["Alpha"])
+register_metric("r_squared", ["market_stats"])(lambda stats: stats["R2"])
+
+register_metric(
+    "rolling_sharpe", ["context", "returns"], ["rolling_window", "trading_days"]
+)(lambda context, returns, rolling_window, trading_days: context.rolling_surface(
+    [rolling_window], trading_days
+)["sharpe"][rolling_window].rename(returns.name))
+register_metric("drawdown_duration", ["prices", "drawdown"])(drawdown_duration)
+register_metric("max_drawdown_duration", ["prices", "drawdown"])(max_drawdown_duration)
+register_metric("recovery_time", ["prices", "drawdown"])(recovery_time)
+
+register_metric("drawdown_events", ["prices", "cumulative_max"])(drawdown_events_df)
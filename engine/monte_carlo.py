@@ -0,0 +1,158 @@
+# engine/monte_carlo.py
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from engine.bootstrap import stationary_bootstrap_indices
+from engine.parallel import run_seeded_batches
+
+
+MONTE_CARLO_METHODS = ("bootstrap", "gbm", "student_t")
+
+
+def _simulate_log_returns(
+    history: np.ndarray,
+    n_paths: int,
+    n_steps: int,
+    method: str,
+    rng: np.random.Generator,
+    mean_block: float,
+    dof: float
+) -> np.ndarray:
+    """(paths x steps) daily log returns under the chosen model."""
+    if method == "bootstrap":
+        indices = stationary_bootstrap_indices(len(history), n_paths, mean_block, rng, length=n_steps)
+        return history[indices.T]
+
+    mu = history.mean()
+    sigma = history.std(ddof=1)
+
+    if method == "gbm":
+        return rng.normal(mu, sigma, size=(n_paths, n_steps))
+
+    # Student-t scaled to the historical variance
+    scale = sigma * np.sqrt((dof - 2) / dof)
+    return mu + scale * rng.standard_t(dof, size=(n_paths, n_steps))
+
+
+def _path_statistics(values: np.ndarray, initial_value: float) -> Dict[str, np.ndarray]:
+    """Final value, max drawdown and days to recover from it, per path."""
+    paths, steps = values.shape
+    peaks = np.maximum.accumulate(np.maximum(values, initial_value), axis=1)
+    drawdowns = values / peaks - 1
+
+    trough = drawdowns.argmin(axis=1)
+    rows = np.arange(paths)
+    peak_at_trough = peaks[rows, trough]
+
+    # First step after the trough back at the pre-trough peak
+    after = np.arange(steps)[None, :] > trough[:, None]
+    recovered = after & (values >= peak_at_trough[:, None])
+    has_recovered = recovered.any(axis=1)
+
+    time_to_recover = np.where(
+        has_recovered,
+        recovered.argmax(axis=1) - trough,
+        np.nan
+    )
+    time_to_recover[drawdowns[rows, trough] == 0] = 0
+
+    return {
+        "final_value": values[:, -1],
+        "max_drawdown": np.minimum(drawdowns.min(axis=1), 0.0),
+        "time_to_recover": time_to_recover
+    }
+
+
+def _simulate_chunk(
+    n_paths: int,
+    seed: np.random.SeedSequence,
+    history: np.ndarray,
+    n_steps: int,
+    method: str,
+    initial_value: float,
+    mean_block: float,
+    dof: float
+) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    log_returns = _simulate_log_returns(history, n_paths, n_steps, method, rng, mean_block, dof)
+    values = initial_value * np.exp(np.cumsum(log_returns, axis=1))
+    return _path_statistics(values, initial_value)
+
+
+def simulate_paths(
+    returns: pd.Series,
+    initial_value: float,
+    n_paths: int = 10_000,
+    n_steps: int = 252,
+    method: str = "bootstrap",
+    seed: int = 0,
+    chunk_size: int = 2_000,
+    workers: Optional[int] = None,
+    mean_block: Optional[float] = None,
+    dof: float = 5.0
+) -> Dict[str, np.ndarray]:
+    """
+    Monte Carlo distribution of an investment's future path.
+
+    method:
+    - "bootstrap" → stationary block bootstrap of historical log returns
+    - "gbm" → normal log returns with the historical mean and volatility
+    - "student_t" → fat-tailed t log returns (dof) with the same moments
+
+    Paths are built as (chunk_size x n_steps) arrays so memory stays
+    bounded. Chunks are seeded and fanned out by
+    engine.parallel.run_seeded_batches, so results are identical with or
+    without workers (> 1 uses a process pool).
+
+    Returns one value per path: final_value, max_drawdown and
+    time_to_recover (days from the max drawdown trough back to its
+    peak; NaN if the path never recovers).
+    """
+    if method not in MONTE_CARLO_METHODS:
+        raise ValueError(f"Unknown Monte Carlo method: {method}")
+
+    history = returns.dropna().to_numpy(dtype=np.float64)
+
+    if len(history) < 2:
+        raise ValueError("Return series is too short to simulate")
+
+    mean_block = mean_block or max(1.0, len(history) ** (1 / 3))
+
+    return run_seeded_batches(
+        _simulate_chunk,
+        n_paths,
+        chunk_size,
+        seed,
+        (history, n_steps, method, initial_value, mean_block, dof),
+        workers
+    )
+
+
+def summarize_paths(
+    paths: Dict[str, np.ndarray],
+    initial_value: float,
+    percentiles=(5, 25, 50, 75, 95)
+) -> dict:
+    """
+    Percentiles of each path statistic plus loss and recovery probabilities.
+    """
+    recovered = ~np.isnan(paths["time_to_recover"])
+
+    summary = {
+        "n_paths": len(paths["final_value"]),
+        "probability_of_loss": float(np.mean(paths["final_value"] < initial_value)),
+        "probability_recovered": float(np.mean(recovered))
+    }
+
+    for name, values in paths.items():
+        values = values[~np.isnan(values)]
+        summary[name] = {
+            f"p{p}": (np.percentile(values, p) if len(values) else np.nan)
+            for p in percentiles
+        }
+        summary[name]["mean"] = values.mean() if len(values) else np.nan
+
+    return summary
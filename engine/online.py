@@ -0,0 +1,119 @@
+# engine/online.py
+
+import math
+
+import numpy as np
+
+from engine.incremental import MomentState, RegressionState
+
+
+class OnlineDrawdown:
+    """
+    Running peak and deepest drawdown of a price stream.
+    """
+
+    def __init__(self):
+        self.peak = -math.inf
+        self.current_drawdown = 0.0
+        self.max_drawdown = 0.0
+
+    def update(self, price: float) -> "OnlineDrawdown":
+        if price > self.peak:
+            self.peak = price
+
+        self.current_drawdown = (price - self.peak) / self.peak
+        if self.current_drawdown < self.max_drawdown:
+            self.max_drawdown = self.current_drawdown
+
+        return self
+
+    def snapshot(self) -> dict:
+        return {
+            "peak": self.peak,
+            "current_drawdown": self.current_drawdown,
+            "max_drawdown": self.max_drawdown
+        }
+
+
+class OnlineRiskMetrics:
+    """
+    Volatility, downside volatility, Sharpe, Sortino, skewness, excess
+    kurtosis and max drawdown of a price stream, updated in O(1) per price.
+
+    snapshot() matches annualized_volatility, downside_volatility,
+    sharpe_ratio, sortino_ratio, skewness, kurtosis_excess and max_drawdown
+    on the same prices, up to floating-point rounding.
+    """
+
+    def __init__(self, trading_days: int = 252):
+        self.trading_days = trading_days
+        self.last_price = None
+        self.returns = MomentState()
+        self.downside = MomentState()
+        self.drawdown = OnlineDrawdown()
+
+    def update(self, price: float) -> "OnlineRiskMetrics":
+        price = float(price)
+
+        if self.last_price is not None:
+            log_return = math.log(price / self.last_price)
+            self.returns.add(log_return)
+            if log_return < 0:
+                self.downside.add(log_return)
+
+        self.last_price = price
+        self.drawdown.update(price)
+        return self
+
+    def snapshot(self) -> dict:
+        scale = math.sqrt(self.trading_days)
+        annual_return = self.returns.mean * self.trading_days if self.returns.n else np.nan
+
+        vol = self.returns.std() * scale
+        down_vol = self.downside.std() * scale if self.downside.n else 0.0
+
+        return {
+            "annualized_volatility": vol,
+            "downside_volatility": down_vol,
+            "sharpe_ratio": annual_return / vol if vol != 0 else np.nan,
+            "sortino_ratio": annual_return / down_vol if down_vol != 0 else np.nan,
+            "skewness": self.returns.skew(),
+            "kurtosis_excess": self.returns.kurtosis(),
+            "max_drawdown": self.drawdown.max_drawdown
+        }
+
+
+class OnlineMarketMetrics:
+    """
+    Running regression of stock on market log returns for paired price
+    ticks. snapshot() matches market_metrics on the same prices.
+    """
+
+    def __init__(self, trading_days: int = 252):
+        self.trading_days = trading_days
+        self.last_price = None
+        self.last_market_price = None
+        self.regression = RegressionState()
+
+    def update(self, price: float, market_price: float) -> "OnlineMarketMetrics":
+        price = float(price)
+        market_price = float(market_price)
+
+        if self.last_price is not None:
+            self.regression.add(
+                math.log(market_price / self.last_market_price),
+                math.log(price / self.last_price)
+            )
+
+        self.last_price = price
+        self.last_market_price = market_price
+        return self
+
+    def snapshot(self) -> dict:
+        fit = self.regression.fit()
+
+        return {
+            "Beta": fit["slope"],
+            "Alpha": fit["intercept"] * self.trading_days,
+            "R2": fit["r_squared"]
+        }
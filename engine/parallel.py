@@ -0,0 +1,44 @@
+# engine/parallel.py
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+
+def run_seeded_batches(
+    func: Callable[..., Dict[str, np.ndarray]],
+    n_items: int,
+    batch_size: int,
+    seed: int,
+    args: Sequence = (),
+    workers: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Run func(size, batch_seed, *args) over batches of at most batch_size
+    items and concatenate the returned arrays by name.
+
+    Every batch gets its own child of SeedSequence(seed), so results
+    depend only on seed and batch_size, never on workers (> 1 spreads
+    batches over a process pool; func must then be picklable).
+    """
+    if n_items < 1 or batch_size < 1:
+        raise ValueError("n_items and batch_size must be positive")
+
+    sizes = [batch_size] * (n_items // batch_size)
+    if n_items % batch_size:
+        sizes.append(n_items % batch_size)
+
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    batch_args = [(size, batch_seed, *args) for size, batch_seed in zip(sizes, seeds)]
+
+    if workers and workers > 1 and len(batch_args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            batches = list(executor.map(func, *zip(*batch_args)))
+    else:
+        batches = [func(*arguments) for arguments in batch_args]
+
+    return {
+        name: np.concatenate([batch[name] for batch in batches])
+        for name in batches[0]
+    }
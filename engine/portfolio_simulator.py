@@ -0,0 +1,131 @@
+# engine/portfolio_simulator.py
+
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+def _period_starts(index: pd.DatetimeIndex, frequency: Optional[str]) -> np.ndarray:
+    """
+    Positions of the first trading day of each new period (the first bar excluded).
+    """
+    if not frequency:
+        return np.empty(0, dtype=np.int64)
+
+    periods = index.to_period(frequency)
+    return np.flatnonzero(periods[1:] != periods[:-1]) + 1
+
+
+def simulate_portfolio(
+    prices: Union[pd.Series, pd.DataFrame],
+    initial_investment: float,
+    weights: Optional[Dict[str, float]] = None,
+    rebalance_frequency: Optional[str] = None,
+    contribution: float = 0.0,
+    contribution_frequency: Optional[str] = "M",
+    transaction_cost: float = 0.0
+) -> Dict:
+    """
+    Simulate a multi-asset portfolio with target weights, periodic
+    rebalancing, periodic contributions (DCA) and proportional costs.
+
+    - weights: target weight per column (equal weights if omitted)
+    - rebalance_frequency / contribution_frequency: pandas period alias
+      ("M", "Q", "Y", ...); trades happen at the close of the first
+      trading day of each period. None disables it.
+    - transaction_cost: fraction of traded notional paid on every trade
+
+    Holdings only change on event days, so the loop runs over events and
+    each segment in between is compounded with one vectorized product.
+    Daily P&L excludes contributions.
+
+    Returns the same summary fields as simulate_investment, plus the
+    contributions and costs paid and the daily P&L series. A single price
+    series with no contributions or costs reproduces simulate_investment.
+    """
+    if isinstance(prices, pd.Series):
+        prices = prices.to_frame()
+
+    # Assets must all have a price; carry gaps forward and start once all trade
+    prices = prices.ffill().dropna()
+
+    if prices.empty:
+        raise ValueError("Price series is empty")
+
+    if weights is None:
+        target = np.full(prices.shape[1], 1 / prices.shape[1])
+    else:
+        target = np.array([weights.get(column, 0.0) for column in prices.columns], dtype=np.float64)
+        if target.sum() <= 0:
+            raise ValueError("Weights must sum to a positive number")
+        target = target / target.sum()
+
+    P = prices.to_numpy(dtype=np.float64)
+    n = len(P)
+
+    contribution_days = _period_starts(prices.index, contribution_frequency) if contribution else np.empty(0, dtype=np.int64)
+    rebalance_days = _period_starts(prices.index, rebalance_frequency)
+    events = np.union1d(contribution_days, rebalance_days)
+
+    contributes = np.zeros(n, dtype=bool)
+    contributes[contribution_days] = True
+    rebalances = np.zeros(n, dtype=bool)
+    rebalances[rebalance_days] = True
+
+    # Capital held in each asset right after trading on the segment's first day
+    allocation = target * (initial_investment / (1 + transaction_cost))
+    total_costs = initial_investment - allocation.sum()
+    total_contributions = 0.0
+
+    values = np.empty(n)
+    flows = np.zeros(n)
+    bounds = np.concatenate([[0], events, [n]]).astype(np.int64)
+
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if start > 0:
+            holdings = allocation * (P[start] / P[segment_start])
+            value = holdings.sum()
+            cash_in = contribution if contributes[start] else 0.0
+
+            if rebalances[start]:
+                desired = target * (value + cash_in)
+                cost = transaction_cost * np.abs(desired - holdings).sum()
+                allocation = desired * ((value + cash_in - cost) / (value + cash_in))
+            else:
+                bought = target * (cash_in / (1 + transaction_cost))
+                cost = cash_in - bought.sum()
+                allocation = holdings + bought
+
+            flows[start] = cash_in
+            total_contributions += cash_in
+            total_costs += cost
+
+        segment_start = start
+        values[start:stop] = (P[start:stop] / P[start]) @ allocation
+
+    portfolio_value = pd.Series(values, index=prices.index)
+    daily_pnl = portfolio_value.diff() - flows
+
+    return {
+        "initial_investment": initial_investment,
+        "final_value": portfolio_value.iloc[-1],
+
+        "min_value": portfolio_value.min(),
+        "min_value_date": portfolio_value.idxmin(),
+
+        "max_value": portfolio_value.max(),
+        "max_value_date": portfolio_value.idxmax(),
+
+        "max_daily_gain": daily_pnl.max(),
+        "max_daily_gain_date": daily_pnl.idxmax(),
+
+        "max_daily_loss": daily_pnl.min(),
+        "max_daily_loss_date": daily_pnl.idxmin(),
+
+        "total_contributions": total_contributions,
+        "total_costs": total_costs,
+
+        "portfolio_series": portfolio_value,
+        "daily_pnl": daily_pnl
+    }
@@ -0,0 +1,156 @@
+# engine/price_providers.py
+
+import os
+import zlib
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+
+class YahooProvider:
+    """
+    Adjusted close prices from Yahoo Finance, many tickers per request.
+    """
+
+    def fetch(
+        self,
+        tickers: List[str],
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None
+    ) -> pd.DataFrame:
+        """
+        Return a wide frame of close prices (dates x tickers) for [start, end).
+        start=None fetches the full available history.
+        """
+        import yfinance as yf
+
+        if start is None:
+            data = yf.download(tickers, period="max", progress=False)
+        else:
+            data = yf.download(tickers, start=start, end=end, progress=False)
+
+        if data.empty:
+            return pd.DataFrame(columns=tickers, dtype=float)
+
+        prices = data["Close"]
+
+        if isinstance(prices, pd.Series):
+            prices = prices.to_frame(tickers[0])
+
+        return prices
+
+
+class CsvDirectoryProvider:
+    """
+    File-backed provider reading {directory}/{ticker}.csv (Date index, Close column).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._frames: Dict[str, pd.Series] = {}
+
+    def _load(self, ticker: str) -> pd.Series:
+        if ticker not in self._frames:
+            path = os.path.join(self.directory, f"{quote(ticker, safe='')}.csv")
+
+            if not os.path.exists(path):
+                self._frames[ticker] = pd.Series(dtype=float, index=pd.DatetimeIndex([]))
+            else:
+                data = pd.read_csv(path, index_col=0, parse_dates=True)
+                column = "Close" if "Close" in data.columns else data.columns[0]
+                self._frames[ticker] = data[column].astype(float).sort_index()
+
+        return self._frames[ticker]
+
+    def fetch(
+        self,
+        tickers: List[str],
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None
+    ) -> pd.DataFrame:
+        columns = {}
+
+        for ticker in tickers:
+            prices = self._load(ticker)
+
+            if start is not None:
+                prices = prices[(prices.index >= start) & (prices.index < end)]
+
+            columns[ticker] = prices
+
+        return pd.DataFrame(columns, columns=tickers)
+
+
+class SyntheticProvider:
+    """
+    Deterministic geometric Brownian motion prices on business days.
+
+    Each ticker gets its own reproducible path, so overlapping requests
+    always agree on the same dates.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        history_start: str = "1990-01-01",
+        annual_drift: float = 0.07,
+        annual_volatility: float = 0.25,
+        trading_days: int = 252
+    ):
+        self.seed = seed
+        self.history_start = pd.Timestamp(history_start)
+        self.annual_drift = annual_drift
+        self.annual_volatility = annual_volatility
+        self.trading_days = trading_days
+
+    def _path(self, ticker: str, end: pd.Timestamp) -> pd.Series:
+        dates = pd.bdate_range(self.history_start, end - pd.Timedelta(days=1), name="Date")
+        rng = np.random.default_rng([self.seed, zlib.crc32(ticker.encode())])
+
+        mu = self.annual_drift / self.trading_days
+        sigma = self.annual_volatility / np.sqrt(self.trading_days)
+        log_returns = rng.normal(mu - 0.5 * sigma ** 2, sigma, len(dates))
+
+        return pd.Series(100 * np.exp(np.cumsum(log_returns)), index=dates)
+
+    def fetch(
+        self,
+        tickers: List[str],
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None
+    ) -> pd.DataFrame:
+        if end is None:
+            end = pd.Timestamp.today().normalize()
+
+        columns = {}
+
+        for ticker in tickers:
+            prices = self._path(ticker, end)
+
+            if start is not None:
+                prices = prices[prices.index >= start]
+
+            columns[ticker] = prices
+
+        return pd.DataFrame(columns, columns=tickers)
+
+
+_default_provider = YahooProvider()
+
+
+def get_price_provider():
+    """
+    Return the provider used when no provider is passed explicitly.
+    """
+    return _default_provider
+
+
+def set_price_provider(provider):
+    """
+    Replace the default provider (e.g. a SyntheticProvider in tests).
+    Any object with a fetch(tickers, start, end) -> DataFrame method works.
+    """
+    global _default_provider
+    _default_provider = provider
@@ -0,0 +1,269 @@
+# engine/price_store.py
+
+import json
+import os
+import tempfile
+import threading
+from typing import List, Optional, Tuple
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+
+# Root directory of the on-disk store (override with the PRICE_STORE_DIR env var)
+PRICE_STORE_DIR = os.environ.get("PRICE_STORE_DIR", "price_store")
+
+INDEX_FILE = "index.json"
+DATES_FILE = "dates.npy"
+CLOSE_FILE = "close.npy"
+
+# store_dir -> (index file mtime, parsed index)
+_INDEX_CACHE = {}
+
+# Serializes writers within the process (array merge + index read-modify-write)
+_WRITE_LOCK = threading.RLock()
+
+
+def _store_dir(store_dir: Optional[str]) -> str:
+    return store_dir if store_dir is not None else PRICE_STORE_DIR
+
+
+def _ticker_dir(ticker: str, store_dir: Optional[str]) -> str:
+    # Tickers like "^GSPC" or "BRK/B" are not safe file names
+    return os.path.join(_store_dir(store_dir), quote(ticker, safe=""))
+
+
+def _atomic_write(path: str, write, mode: str = "wb"):
+    # Unique temp name in the target directory, so concurrent writers never share it
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _atomic_write_array(path: str, array: np.ndarray):
+    _atomic_write(path, lambda f: np.save(f, array))
+
+
+def _to_naive_ns(index) -> pd.DatetimeIndex:
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit("ns")
+
+
+def load_index(store_dir: Optional[str] = None) -> dict:
+    """
+    Load the store index: per-ticker metadata kept next to the price arrays.
+
+    Each entry holds the fetched [covered_start, covered_end) range, the
+    first / last stored date, the row count, the last refresh time and
+    whether the full listing history is stored. The parsed index is kept
+    in memory and only re-read when the file changes on disk.
+    """
+    store_dir = _store_dir(store_dir)
+    path = os.path.join(store_dir, INDEX_FILE)
+
+    if not os.path.exists(path):
+        return {}
+
+    mtime = os.stat(path).st_mtime_ns
+    cached = _INDEX_CACHE.get(store_dir)
+
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "r") as f:
+        index = json.load(f)
+
+    _INDEX_CACHE[store_dir] = (mtime, index)
+    return index
+
+
+def _save_index(index: dict, store_dir: Optional[str]):
+    store_dir = _store_dir(store_dir)
+    path = os.path.join(store_dir, INDEX_FILE)
+    _atomic_write(path, lambda f: json.dump(index, f, indent=2, sort_keys=True), mode="w")
+
+    _INDEX_CACHE[store_dir] = (os.stat(path).st_mtime_ns, index)
+
+
+def get_ticker_metadata(
+    ticker: str,
+    store_dir: Optional[str] = None
+) -> Optional[dict]:
+    """
+    Return the index entry of a ticker with dates parsed, or None if not stored.
+    """
+    entry = load_index(store_dir).get(ticker)
+
+    if entry is None:
+        return None
+
+    metadata = dict(entry)
+    for key in ("covered_start", "covered_end", "first_date", "last_date", "refreshed_at"):
+        if metadata.get(key) is not None:
+            metadata[key] = pd.Timestamp(metadata[key])
+
+    metadata.setdefault("full_history", False)
+    return metadata
+
+
+def get_coverage(
+    ticker: str,
+    store_dir: Optional[str] = None
+) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """
+    Return the [start, end) date range already fetched for a ticker, or None.
+    """
+    metadata = get_ticker_metadata(ticker, store_dir)
+
+    if metadata is None:
+        return None
+
+    return metadata["covered_start"], metadata["covered_end"]
+
+
+def missing_ranges(
+    ticker: str,
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    store_dir: Optional[str] = None
+) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """
+    Date ranges in [start, end) that still have to be fetched for a ticker.
+
+    Coverage is kept as a single contiguous range, so a request that lies
+    completely outside of it also fetches the gap in between. Nothing
+    before covered_start is missing once the full history is stored.
+    """
+    metadata = get_ticker_metadata(ticker, store_dir)
+
+    if metadata is None:
+        return [(start, end)] if start < end else []
+
+    covered_start = metadata["covered_start"]
+    covered_end = metadata["covered_end"]
+
+    if metadata["full_history"]:
+        start = max(start, covered_start)
+
+    if start >= end:
+        return []
+
+    gaps = []
+
+    if start < covered_start:
+        gaps.append((start, covered_start))
+
+    if end > covered_end:
+        gaps.append((covered_end, end))
+
+    return gaps
+
+
+def read_prices(
+    ticker: str,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+    store_dir: Optional[str] = None
+) -> Optional[pd.Series]:
+    """
+    Read stored close prices for [start, end) from the memory-mapped arrays.
+
+    Only the requested slice is copied into memory.
+    """
+    ticker_dir = _ticker_dir(ticker, store_dir)
+    dates_path = os.path.join(ticker_dir, DATES_FILE)
+
+    if not os.path.exists(dates_path):
+        return None
+
+    dates = np.load(dates_path, mmap_mode="r")
+    close = np.load(os.path.join(ticker_dir, CLOSE_FILE), mmap_mode="r")
+
+    lo = 0 if start is None else np.searchsorted(dates, np.datetime64(start, "ns"), side="left")
+    hi = len(dates) if end is None else np.searchsorted(dates, np.datetime64(end, "ns"), side="left")
+
+    index = pd.DatetimeIndex(np.array(dates[lo:hi]), name="Date")
+    return pd.Series(np.array(close[lo:hi]), index=index, name=ticker)
+
+
+def write_prices(
+    ticker: str,
+    prices: pd.Series,
+    covered_start: pd.Timestamp,
+    covered_end: pd.Timestamp,
+    full_history: bool = False,
+    store_dir: Optional[str] = None
+) -> int:
+    """
+    Merge freshly fetched prices into the store and update the ticker index entry.
+
+    Newly fetched values win over stored ones on overlapping dates.
+    full_history=True marks covered_start as the first listed date.
+    Returns the number of stored rows. Safe to call from several threads.
+    """
+    with _WRITE_LOCK:
+        return _write_prices(ticker, prices, covered_start, covered_end, full_history, store_dir)
+
+
+def _write_prices(
+    ticker: str,
+    prices: pd.Series,
+    covered_start: pd.Timestamp,
+    covered_end: pd.Timestamp,
+    full_history: bool,
+    store_dir: Optional[str]
+) -> int:
+    ticker_dir = _ticker_dir(ticker, store_dir)
+    os.makedirs(ticker_dir, exist_ok=True)
+
+    new = pd.Series(
+        np.asarray(prices, dtype=np.float64),
+        index=_to_naive_ns(prices.index)
+    ).dropna()
+
+    existing = read_prices(ticker, store_dir=store_dir)
+
+    if existing is not None and not existing.empty:
+        merged = pd.concat([existing, new])
+        merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+    else:
+        merged = new.sort_index()
+
+    _atomic_write_array(
+        os.path.join(ticker_dir, DATES_FILE),
+        merged.index.values.astype("datetime64[ns]")
+    )
+    _atomic_write_array(
+        os.path.join(ticker_dir, CLOSE_FILE),
+        merged.values.astype(np.float64)
+    )
+
+    index = dict(load_index(store_dir))
+    entry = index.get(ticker)
+
+    if entry is not None:
+        covered_start = min(covered_start, pd.Timestamp(entry["covered_start"]))
+        covered_end = max(covered_end, pd.Timestamp(entry["covered_end"]))
+        full_history = full_history or entry.get("full_history", False)
+
+    index[ticker] = {
+        "covered_start": covered_start.date().isoformat(),
+        "covered_end": covered_end.date().isoformat(),
+        "first_date": merged.index[0].isoformat() if len(merged) else None,
+        "last_date": merged.index[-1].isoformat() if len(merged) else None,
+        "rows": len(merged),
+        "refreshed_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "full_history": full_history
+    }
+    _save_index(index, store_dir)
+
+    return len(merged)
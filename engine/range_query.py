@@ -0,0 +1,220 @@
+# engine/range_query.py
+
+import numpy as np
+import pandas as pd
+
+
+def _level(length: np.ndarray) -> np.ndarray:
+    """floor(log2(length)) for positive integer lengths."""
+    return (np.frexp(np.asarray(length, dtype=np.float64))[1] - 1).astype(np.int64)
+
+
+class SparseTable:
+    """
+    Range minimum or maximum of a fixed array in O(1) per query after
+    O(n log n) preprocessing. Queries are vectorized over index arrays.
+    """
+
+    def __init__(self, values: np.ndarray, op=np.minimum):
+        self.op = op
+        self.table = [np.asarray(values, dtype=np.float64)]
+
+        span = 1
+        while 2 * span <= len(values):
+            previous = self.table[-1]
+            self.table.append(op(previous[:-span], previous[span:]))
+            span *= 2
+
+    def query(self, left, right):
+        """Min / max of values[left..right] (both inclusive)."""
+        left = np.asarray(left)
+        right = np.asarray(right)
+        k = _level(right - left + 1)
+
+        if k.ndim == 0:
+            level = self.table[k]
+            return self.op(level[left], level[right - (1 << k) + 1])
+
+        result = np.empty(np.broadcast(left, right).shape)
+        left, right = np.broadcast_arrays(left, right)
+
+        for level_k in np.unique(k):
+            hit = k == level_k
+            level = self.table[level_k]
+            result[hit] = self.op(
+                level[left[hit]],
+                level[right[hit] - (1 << level_k) + 1]
+            )
+
+        return result
+
+
+class DrawdownSparseTable:
+    """
+    Maximum drawdown of any contiguous range of prices in O(1).
+
+    Each block of length 2**k stores its highest price, lowest price and
+    internal max drawdown. Two blocks A (earlier) and B combine as
+
+        mdd(A ∪ B) = min(mdd(A), mdd(B), (min(B \\ A) - max(A)) / max(A))
+
+    since a drawdown either stays within one block or runs from a peak in
+    A to a trough in the part of B after A. A query covers [left, right]
+    with two overlapping blocks and reads min(B \\ A) from the min table.
+    Values match engine.risk.max_drawdown on the same slice.
+    """
+
+    def __init__(self, prices: np.ndarray):
+        prices = np.asarray(prices, dtype=np.float64)
+
+        self.max_table = SparseTable(prices, np.maximum)
+        self.min_table = SparseTable(prices, np.minimum)
+        self.mdd_table = [np.zeros(len(prices))]
+
+        span = 1
+        while 2 * span <= len(prices):
+            previous = self.mdd_table[-1]
+            level = len(self.mdd_table) - 1
+            peak_a = self.max_table.table[level][:-span]
+            trough_b = self.min_table.table[level][span:]
+
+            self.mdd_table.append(np.minimum(
+                np.minimum(previous[:-span], previous[span:]),
+                (trough_b - peak_a) / peak_a
+            ))
+            span *= 2
+
+    def query(self, left, right):
+        """Max drawdown of prices[left..right] (both inclusive)."""
+        left, right = np.broadcast_arrays(np.asarray(left), np.asarray(right))
+        k = _level(right - left + 1)
+
+        result = np.empty(left.shape)
+
+        for level_k in np.unique(k):
+            hit = k == level_k
+            lo = left[hit]
+            hi = right[hit]
+            start_b = hi - (1 << level_k) + 1
+
+            mdd = np.minimum(
+                self.mdd_table[level_k][lo],
+                self.mdd_table[level_k][start_b]
+            )
+
+            # Part of the right block not covered by the left block
+            end_a = lo + (1 << level_k) - 1
+            tail = hi > end_a
+
+            if tail.any():
+                peak_a = self.max_table.table[level_k][lo[tail]]
+                trough = self.min_table.query(end_a[tail] + 1, hi[tail])
+                mdd[tail] = np.minimum(mdd[tail], (trough - peak_a) / peak_a)
+
+            result[hit] = mdd
+
+        return result if result.ndim else result.item()
+
+
+class PriceRangeIndex:
+    """
+    Metrics of any sub-period [start, end] of one price series in O(1).
+
+    Built once per series: prefix sums of (demeaned) log returns and their
+    squares give the mean and volatility of any window, and a drawdown
+    sparse table gives its max drawdown. Each method follows the engine
+    function it mirrors on prices.loc[start:end] (same errors, same NaN
+    rules): total_return and cagr (engine.growth), annualized_volatility
+    and max_drawdown (engine.risk), sharpe_ratio (engine.risk_adjusted).
+    Volatility and Sharpe agree with them to floating-point rounding,
+    the others exactly.
+
+    start / end are dates (inclusive, like .loc) or None for the series ends.
+    """
+
+    def __init__(self, prices: pd.Series, trading_days: int = 252):
+        self.index = prices.index
+        self.trading_days = trading_days
+        self.values = prices.to_numpy(dtype=np.float64)
+
+        returns = np.log(self.values[1:] / self.values[:-1])
+        self._shift = returns.mean() if len(returns) else 0.0
+        centered = returns - self._shift
+
+        # _sums[i] = sum of the first i (centered) returns
+        self._sums = np.concatenate([[0.0], np.cumsum(centered)])
+        self._squares = np.concatenate([[0.0], np.cumsum(centered * centered)])
+
+        self._drawdowns = DrawdownSparseTable(self.values)
+
+    def positions(self, start=None, end=None):
+        """Positions (i, j) of the first and last bar inside [start, end]."""
+        i = 0 if start is None else int(self.index.searchsorted(pd.Timestamp(start), side="left"))
+        j = len(self.index) - 1 if end is None else int(self.index.searchsorted(pd.Timestamp(end), side="right")) - 1
+        return i, j
+
+    def _prices_range(self, start, end):
+        i, j = self.positions(start, end)
+        if j < i:
+            raise ValueError("Price series is empty")
+        return i, j
+
+    def _returns_stats(self, start, end):
+        i, j = self.positions(start, end)
+        count = j - i
+        if count < 1:
+            raise ValueError("Return series is empty")
+
+        window_sum = self._sums[j] - self._sums[i]
+        mean = window_sum / count + self._shift
+
+        if count < 2:
+            return mean, np.nan
+
+        window_squares = self._squares[j] - self._squares[i]
+        variance = (window_squares - window_sum * window_sum / count) / (count - 1)
+        return mean, np.sqrt(max(variance, 0.0))
+
+    # -------------------------
+    # Metrics
+    # -------------------------
+
+    def total_return(self, start=None, end=None) -> float:
+        i, j = self._prices_range(start, end)
+        return (self.values[j] / self.values[i]) - 1
+
+    def cagr(self, start=None, end=None) -> float:
+        i, j = self._prices_range(start, end)
+        num_years = (self.index[j] - self.index[i]).days / 365.25
+
+        if num_years <= 0:
+            raise ValueError("Date range too short for CAGR calculation")
+
+        return (self.values[j] / self.values[i]) ** (1 / num_years) - 1
+
+    def annualized_volatility(self, start=None, end=None) -> float:
+        _, std = self._returns_stats(start, end)
+        return std * np.sqrt(self.trading_days)
+
+    def sharpe_ratio(self, start=None, end=None, risk_free_rate: float = 0.0) -> float:
+        mean, std = self._returns_stats(start, end)
+        vol = std * np.sqrt(self.trading_days)
+
+        if vol == 0:
+            return np.nan
+
+        return (mean * self.trading_days - risk_free_rate) / vol
+
+    def max_drawdown(self, start=None, end=None) -> float:
+        i, j = self._prices_range(start, end)
+        return self._drawdowns.query(i, j)
+
+    def metrics(self, start=None, end=None) -> dict:
+        """All supported metrics of one sub-period."""
+        return {
+            "total_return": self.total_return(start, end),
+            "cagr": self.cagr(start, end),
+            "annualized_volatility": self.annualized_volatility(start, end),
+            "sharpe_ratio": self.sharpe_ratio(start, end),
+            "max_drawdown": self.max_drawdown(start, end)
+        }
@@ -13,7 +13,11 @@ def annualized_volatility(returns: pd.Series, trading_days: int = 252) -> float:
     return returns.std() * np.sqrt(trading_days)
 
 
-def downside_volatility(returns: pd.Series, trading_days: int = 252) -> float:
+def downside_volatility(
+    returns: pd.Series,
+    trading_days: int = 252,
+    downside_returns: pd.Series = None
+) -> float:
     """
     Compute downside volatility (negative returns only) for the entire dataset like when volatility
     occurs what percent of it is downwards out of 100.
@@ -21,7 +25,8 @@ def downside_volatility(returns: pd.Series, trading_days: int = 252) -> float:
     if returns.empty:
         raise ValueError("Return series is empty")
 
-    downside_returns = returns[returns < 0]
+    if downside_returns is None:
+        downside_returns = returns[returns < 0]
 
     if downside_returns.empty:
         return 0.0
@@ -29,14 +34,16 @@ def downside_volatility(returns: pd.Series, trading_days: int = 252) -> float:
     return downside_returns.std() * np.sqrt(trading_days)
 
 
-def max_drawdown(prices: pd.Series) -> float:
+def max_drawdown(prices: pd.Series, drawdowns: pd.Series = None) -> float:
     """
     Compute maximum drawdown from price series for the entire dataset.
+    A precomputed drawdown series can be passed to skip rebuilding it.
     """
     if prices.empty:
         raise ValueError("Price series is empty")
 
-    cumulative_max = prices.cummax()
-    drawdowns = (prices - cumulative_max) / cumulative_max
+    if drawdowns is None:
+        cumulative_max = prices.cummax()
+        drawdowns = (prices - cumulative_max) / cumulative_max
 
     return drawdowns.min()
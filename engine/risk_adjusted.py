@@ -27,7 +27,8 @@ def sharpe_ratio(
 def sortino_ratio(
     returns: pd.Series,
     risk_free_rate: float = 0.0,
-    trading_days: int = 252
+    trading_days: int = 252,
+    downside_returns: pd.Series = None
 ) -> float:
     """
     Compute annualized Sortino Ratio.
@@ -36,7 +37,7 @@ def sortino_ratio(
         raise ValueError("Return series is empty")
 
     annual_return = returns.mean() * trading_days
-    down_vol = downside_volatility(returns, trading_days)
+    down_vol = downside_volatility(returns, trading_days, downside_returns)
 
     if down_vol == 0:
         return np.nan
@@ -44,11 +45,11 @@ def sortino_ratio(
     return (annual_return - risk_free_rate) / down_vol
 
 
-def calmar_ratio(prices: pd.Series) -> float:
+def calmar_ratio(prices: pd.Series, drawdowns: pd.Series = None) -> float:
     """
     Compute Calmar Ratio = CAGR / |Max Drawdown|
     """
-    mdd = max_drawdown(prices)
+    mdd = max_drawdown(prices, drawdowns)
 
     if mdd == 0:
         return np.nan
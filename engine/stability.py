@@ -1,3 +1,5 @@
+from typing import Sequence
+
 import numpy as np
 import pandas as pd
 
@@ -15,41 +17,124 @@ def rolling_sharpe(
     return rolling_mean / rolling_std
 
 
-def drawdown_series(prices: pd.Series) -> pd.Series:
+def _constant_windows(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    For each full window (ending at window - 1, window, ...), whether all
+    its values are identical. Exact, so flat stretches (e.g. trading
+    halts) are not left with cumulative-sum rounding noise.
+    """
+    changes = np.concatenate([[0], np.cumsum(values[1:] != values[:-1])])
+    return changes[window - 1:] == changes[:len(values) - window + 1]
+
+
+def rolling_sharpe_surface(
+    returns: pd.Series,
+    windows: Sequence[int] = (21, 63, 126, 252),
+    trading_days: int = 252
+) -> pd.DataFrame:
+    """
+    Rolling annualized mean, volatility and Sharpe ratio for several windows.
+
+    One cumulative sum and one cumulative sum of squares serve every
+    window. Returns are centered on their sample mean first so the sums
+    stay well conditioned. Columns are (metric, window) with metric
+    "mean", "volatility" or "sharpe", so each metric is a dates x windows
+    block (NaN until a window fills). Flat windows match pandas: zero
+    volatility, so Sharpe is NaN when their returns are zero.
+    """
+    values = returns.to_numpy(dtype=np.float64)
+    shift = values.mean() if len(values) else 0.0
+    centered = values - shift
+
+    sums = np.concatenate([[0.0], np.cumsum(centered)])
+    squares = np.concatenate([[0.0], np.cumsum(centered * centered)])
+
+    windows = list(windows)
+    mean = np.full((len(values), len(windows)), np.nan)
+    vol = np.full_like(mean, np.nan)
+
+    for j, window in enumerate(windows):
+        if window > len(values) or window < 2:
+            continue
+
+        window_sum = sums[window:] - sums[:-window]
+        window_squares = squares[window:] - squares[:-window]
+        variance = (window_squares - window_sum * window_sum / window) / (window - 1)
+
+        # Constant windows get their exact mean and zero volatility, as in pandas
+        constant = _constant_windows(values, window)
+        mean[window - 1:, j] = np.where(constant, values[window - 1:], window_sum / window + shift)
+        vol[window - 1:, j] = np.where(constant, 0.0, np.sqrt(np.maximum(variance, 0.0)))
+
+    mean *= trading_days
+    vol *= np.sqrt(trading_days)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = mean / vol
+
+    columns = pd.MultiIndex.from_product(
+        [["mean", "volatility", "sharpe"], windows],
+        names=["metric", "window"]
+    )
+    return pd.DataFrame(np.hstack([mean, vol, sharpe]), index=returns.index, columns=columns)
+
+
+def drawdown_series(prices: pd.Series, cumulative_max: pd.Series = None) -> pd.Series:
     """
     Compute drawdown series.
     """
-    cumulative_max = prices.cummax()
+    if cumulative_max is None:
+        cumulative_max = prices.cummax()
     return (prices - cumulative_max) / cumulative_max
 
 
-def drawdown_duration(prices: pd.Series) -> pd.Series:
+def _underwater_mask(prices: pd.Series, drawdowns: pd.Series = None) -> np.ndarray:
+    """
+    Boolean mask of bars below the running peak (the first bar never counts).
+    """
+    if drawdowns is None:
+        values = prices.to_numpy(dtype=np.float64)
+        underwater = values < np.maximum.accumulate(values)
+    else:
+        underwater = drawdowns.to_numpy() < 0
+
+    underwater[:1] = False
+    return underwater
+
+
+def drawdown_duration(prices: pd.Series, drawdowns: pd.Series = None) -> pd.Series:
     """
     Compute drawdown duration (time spent underwater).
     """
-    dd = drawdown_series(prices)
-    duration = np.zeros(len(dd))
-    for i in range(1, len(dd)):
-        if dd.iloc[i] < 0:
-            duration[i] = duration[i - 1] + 1
-        else:
-            duration[i] = 0
-    return pd.Series(duration, index=dd.index)
+    underwater = _underwater_mask(prices, drawdowns)
+
+    # Running count of underwater bars, reset to zero at every new peak
+    count = np.cumsum(underwater)
+    count_at_reset = np.maximum.accumulate(np.where(underwater, 0, count))
+    duration = (count - count_at_reset).astype(np.float64)
 
+    index = prices.index if drawdowns is None else drawdowns.index
+    return pd.Series(duration, index=index)
 
-def max_drawdown_duration(prices: pd.Series) -> int:
+
+def max_drawdown_duration(prices: pd.Series, drawdowns: pd.Series = None) -> int:
     """
     Maximum drawdown duration.
+    Computed from underwater run lengths without building the duration series.
     """
-    duration = drawdown_duration(prices)
-    return int(duration.max())
+    underwater = _underwater_mask(prices, drawdowns)
+
+    edges = np.diff(underwater.astype(np.int8), prepend=0, append=0)
+    run_lengths = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+
+    return int(run_lengths.max()) if len(run_lengths) else 0
 
 
-def recovery_time(prices: pd.Series) -> int:
+def recovery_time(prices: pd.Series, drawdowns: pd.Series = None) -> int:
     """
     Time taken to recover from maximum drawdown.
     """
-    dd = drawdown_series(prices)
+    dd = drawdown_series(prices) if drawdowns is None else drawdowns
     trough_date = dd.idxmin()
     peak_before = prices.loc[:trough_date].idxmax()
 
@@ -1,7 +1,12 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Sequence
+
 import numpy as np
 import pandas as pd
 from scipy.stats import skew, kurtosis
 
+from engine.quantile_sketch import KLLSketch, build_sketch
+
 
 def skewness(returns: pd.Series) -> float:
     """
@@ -23,25 +28,150 @@ def kurtosis_excess(returns: pd.Series) -> float:
     return kurtosis(returns, fisher=True)
 
 
+def _percentile_from_sorted(sorted_values: np.ndarray, percentile: float) -> float:
+    """
+    Linear-interpolated percentile of an already sorted array (same result as np.percentile).
+    """
+    virtual_index = (len(sorted_values) - 1) * (percentile / 100)
+    lower = int(np.floor(virtual_index))
+    upper = min(lower + 1, len(sorted_values) - 1)
+    gamma = virtual_index - lower
+
+    a = sorted_values[lower]
+    b = sorted_values[upper]
+    diff = b - a
+
+    # np.percentile interpolates from the nearer end point
+    if gamma >= 0.5:
+        return b - diff * (1 - gamma)
+    return a + diff * gamma
+
+
 def value_at_risk(
     returns: pd.Series,
-    confidence_level: float = 0.95
+    confidence_level: float = 0.95,
+    sorted_returns: np.ndarray = None
 ) -> float:
     """
     Historical Value at Risk (VaR).
+    Pass pre-sorted returns to read the percentile without re-sorting.
     """
     if returns.empty:
         raise ValueError("Return series is empty")
 
+    if sorted_returns is not None:
+        return _percentile_from_sorted(sorted_returns, (1 - confidence_level) * 100)
+
     return np.percentile(returns, (1 - confidence_level) * 100)
 
 
 def conditional_value_at_risk(
     returns: pd.Series,
-    confidence_level: float = 0.95
+    confidence_level: float = 0.95,
+    sorted_returns: np.ndarray = None
 ) -> float:
     """
     Conditional Value at Risk (CVaR / Expected Shortfall).
     """
-    var = value_at_risk(returns, confidence_level)
+    var = value_at_risk(returns, confidence_level, sorted_returns)
+
+    if sorted_returns is not None:
+        tail_size = np.searchsorted(sorted_returns, var, side="right")
+        return sorted_returns[:tail_size].mean()
+
     return returns[returns <= var].mean()
+
+
+def sketch_tail_risk(
+    returns,
+    confidence_level: float = 0.95,
+    k: int = 200,
+    chunk_size: int = 1_000_000
+) -> dict:
+    """
+    Approximate VaR / CVaR from a KLL quantile sketch.
+
+    returns is either a return series (consumed in chunks of chunk_size)
+    or an already built KLLSketch, e.g. one merged across workers or days.
+    Memory stays bounded by the sketch size. The rank error bound is also
+    given as the VaR range it implies (var_lower / var_upper). A bound is
+    NaN when it falls outside [0, 1] in rank (e.g. 99% VaR with k=200):
+    the sketch cannot bound the VaR on that side, and the series minimum
+    or maximum would only look like a bound.
+    """
+    if isinstance(returns, KLLSketch):
+        sketch = returns
+    else:
+        values = np.asarray(returns, dtype=np.float64)
+        sketch = build_sketch(
+            (values[i:i + chunk_size] for i in range(0, len(values), chunk_size)),
+            k=k
+        )
+
+    if sketch.n == 0:
+        raise ValueError("Return series is empty")
+
+    q = 1 - confidence_level
+    rank_error = sketch.normalized_rank_error()
+    var = sketch.quantile(q)
+
+    lower_rank = q - rank_error
+    upper_rank = q + rank_error
+
+    return {
+        "value_at_risk": var,
+        "conditional_value_at_risk": sketch.tail_mean(var),
+        "rank_error": rank_error,
+        "var_lower": sketch.quantile(lower_rank) if lower_rank >= 0 else np.nan,
+        "var_upper": sketch.quantile(upper_rank) if upper_rank <= 1 else np.nan,
+        "retained_items": sketch.num_retained
+    }
+
+
+def rolling_tail_risk(
+    returns: pd.Series,
+    window: int = 250,
+    confidence_levels: Sequence[float] = (0.95, 0.99)
+) -> pd.DataFrame:
+    """
+    Rolling historical VaR and CVaR for several confidence levels in one pass.
+
+    The window is kept as a sorted list: each step inserts the new return
+    and removes the expired one by bisection, so no window is re-sorted.
+    Columns are (metric, confidence_level) with metric "value_at_risk" or
+    "conditional_value_at_risk"; values match value_at_risk /
+    conditional_value_at_risk on each window (NaN until the window fills).
+    """
+    values = returns.to_numpy(dtype=np.float64)
+
+    if np.isnan(values).any():
+        raise ValueError("Return series contains NaN")
+
+    levels = list(confidence_levels)
+    percentiles = [(1 - level) * 100 for level in levels]
+    output = np.full((len(values), 2 * len(levels)), np.nan)
+
+    values = values.tolist()
+    window_sorted = []
+
+    for i, x in enumerate(values):
+        insort(window_sorted, x)
+
+        if i >= window:
+            del window_sorted[bisect_left(window_sorted, values[i - window])]
+
+        if i + 1 < window:
+            continue
+
+        for j, percentile in enumerate(percentiles):
+            var = _percentile_from_sorted(window_sorted, percentile)
+            tail_size = bisect_right(window_sorted, var)
+
+            output[i, j] = var
+            output[i, len(levels) + j] = sum(window_sorted[:tail_size]) / tail_size
+
+    columns = pd.MultiIndex.from_product(
+        [["value_at_risk", "conditional_value_at_risk"], levels],
+        names=["metric", "confidence_level"]
+    )
+    return pd.DataFrame(output, index=returns.index, columns=columns)
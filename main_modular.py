@@ -10,7 +10,9 @@ from chat.research_chatbot import research_bot
 
 ANALYSIS_SETTINGS = {
     "use_cache": False,     # 💾 True = faster after first run
-    "initial_capital": 100_000
+    "initial_capital": 100_000,
+    "max_workers": 4,       # ⚡ >1 = run pipelines concurrently, 1 = sequential
+    "extra_metrics": []     # 📐 registered metric names to add (engine.metric_graph)
 }
 
 
@@ -29,7 +31,9 @@ def main():
         start_date=start_date,
         end_date=end_date,
         initial_capital=ANALYSIS_SETTINGS["initial_capital"],
-        use_cache=ANALYSIS_SETTINGS["use_cache"]
+        use_cache=ANALYSIS_SETTINGS["use_cache"],
+        max_workers=ANALYSIS_SETTINGS["max_workers"],
+        metrics=ANALYSIS_SETTINGS["extra_metrics"]
     )
 
     # -------------------------------------
@@ -2,6 +2,7 @@
 
 import pandas as pd
 
+from engine.analysis_context import AnalysisContext
 from engine.drawdown_events import drawdown_events_df
 from visuals.drawdown_events_plots import (
     show_top_drawdowns,
@@ -45,7 +46,8 @@ def run_drawdown_events(
     n: int = 10,
     use_llm: bool = False,
     use_visuals: bool = False,
-    verbose: bool = False
+    verbose: bool = False,
+    context: AnalysisContext = None
 ):
     """
     Drawdown & Recovery Pipeline (Professional Version)
@@ -54,12 +56,15 @@ def run_drawdown_events(
     - verbose → print tables
     - use_visuals → show plots
     - use_llm → generate explanations
+
+    context → shared AnalysisContext (built from prices if omitted)
     """
 
     # -------------------------
     # 1️⃣ Extract drawdown events
     # -------------------------
-    dd_events = drawdown_events_df(prices)
+    context = context or AnalysisContext(prices)
+    dd_events = drawdown_events_df(prices, context.cumulative_max)
 
     if dd_events.empty:
         if verbose:
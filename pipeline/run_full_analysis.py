@@ -1,8 +1,12 @@
 # pipeline/run_full_analysis.py
 
-import os
-import json
+from concurrent.futures import ThreadPoolExecutor
+
+from engine.benchmark_cache import get_benchmark
 from engine.data_loader import load_price_data
+from engine.analysis_cache import cache_key, load_analysis, save_analysis
+from engine.analysis_context import AnalysisContext
+from engine.metric_graph import compute_metrics
 
 from pipeline.run_growth import run_growth_metrics
 from pipeline.run_risk import run_risk_metrics
@@ -14,102 +18,213 @@ from pipeline.run_investment_simulation import run_investment_simulation
 from pipeline.run_drawdown_events import run_drawdown_events
 
 
-def run_full_analysis(
+def analyze_prices(
+    prices,
     ticker: str,
     start_date: str,
     end_date: str,
     initial_capital: float = 100_000,
-    use_cache: bool = False
-):
-
-    cache_file = f"cache_{ticker}_{start_date}_{end_date}.json"
+    use_visuals: bool = True,
+    max_workers: int = None,
+    market_ticker: str = "^GSPC",
+    metrics=None
+) -> dict:
+    """
+    Run every pipeline on an already loaded price series and return
+    the structured chatbot context.
+
+    use_visuals=False suppresses the growth charts shown by default.
+    market_ticker → benchmark for beta, alpha and R².
+    metrics → opt-in list of extra engine.metric_graph metrics (e.g. ones
+    registered with register_metric) returned under "metrics". They are
+    scheduled on the shared context; the pipelines' own metrics are not
+    recomputed unless listed.
+
+    max_workers > 1 runs the other pipelines on a thread pool while the
+    growth pipeline (and its charts) runs on the calling thread, so the
+    benchmark download and any LLM calls overlap with computation.
+    Results are the same as the sequential run.
+    """
+
+    # Intermediates (returns, drawdowns, ...) are computed once and shared
+    context = AnalysisContext(prices)
 
     # -------------------------------------
-    # Load From Cache
+    # Run Pipelines
     # -------------------------------------
-    if use_cache and os.path.exists(cache_file):
-        print("⚡ Loading analysis from cache...")
-        with open(cache_file, "r") as f:
-            return json.load(f)
 
-    print("📊 Running fresh analysis...")
+    # Market first so its benchmark download starts as early as possible
+    stages = {
+        "market_sensitivity": lambda: run_market_sensitivity_metrics(
+            prices, ticker, start_date, end_date,
+            market_ticker=market_ticker,
+            context=context
+        ),
+        "risk": lambda: run_risk_metrics(
+            prices, ticker, start_date, end_date,
+            context=context
+        ),
+        "risk_adjusted": lambda: run_risk_adjusted_metrics(
+            prices, ticker, start_date, end_date,
+            context=context
+        ),
+        "tail_risk": lambda: run_tail_risk_metrics(
+            prices, ticker, start_date, end_date,
+            context=context
+        ),
+        "stability": lambda: run_stability_metrics(
+            prices, ticker, start_date, end_date,
+            context=context
+        ),
+        "investment_simulation": lambda: run_investment_simulation(
+            prices, ticker, start_date, end_date,
+            initial_capital=initial_capital,
+            context=context
+        ),
+        # ✅ NEW: Drawdown Events
+        "drawdown_events": lambda: run_drawdown_events(
+            prices,
+            ticker,
+            start_date,
+            end_date,
+            use_llm=False,   # keep off unless needed
+            context=context
+        )
+    }
 
-    # -------------------------------------
-    # Load Data
-    # -------------------------------------
-    prices = load_price_data(
-        ticker=ticker,
-        start=start_date,
-        end=end_date
-    )
+    if metrics:
+        stages["metrics"] = lambda: compute_metrics(
+            prices,
+            metrics,
+            params={
+                "market_ticker": market_ticker,
+                "start_date": start_date,
+                "end_date": end_date
+            },
+            max_workers=max_workers if max_workers and max_workers > 1 else 1,
+            context=context
+        )
+
+    def run_growth():
+        return run_growth_metrics(
+            prices, ticker, start_date, end_date,
+            use_visuals=use_visuals,
+            context=context
+        )
+
+    if max_workers and max_workers > 1:
+        # Build shared intermediates up front so threads only read them
+        for name in ("returns", "downside_returns", "sorted_returns", "cumulative_max", "drawdown"):
+            getattr(context, name)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {name: executor.submit(stage) for name, stage in stages.items()}
+
+            # Charts must be drawn on the main thread
+            growth_results = run_growth()
+            results = {name: future.result() for name, future in futures.items()}
+    else:
+        growth_results = run_growth()
+        results = {name: stage() for name, stage in stages.items()}
 
     # -------------------------------------
-    # Run Pipelines
+    # Build Structured Chatbot Context
     # -------------------------------------
 
-    growth_results = run_growth_metrics(
-        prices, ticker, start_date, end_date
-    )
-
-    risk_results = run_risk_metrics(
-        prices, ticker, start_date, end_date
-    )
-
-    risk_adjusted_results = run_risk_adjusted_metrics(
-        prices, ticker, start_date, end_date
-    )
+    analysis = {
+        "ticker": ticker,
+        "start_date": start_date,
+        "end_date": end_date,
+        "growth": growth_results,
+        "risk": results["risk"],
+        "risk_adjusted": results["risk_adjusted"],
+        "tail_risk": results["tail_risk"],
+        "market_sensitivity": results["market_sensitivity"],
+        "stability": results["stability"],
+        "investment_simulation": results["investment_simulation"],
+        "drawdown_events": results["drawdown_events"]   # ✅ added here
+    }
 
-    tail_risk_results = run_tail_risk_metrics(
-        prices, ticker, start_date, end_date
-    )
+    if metrics:
+        analysis["metrics"] = results["metrics"]
 
-    market_results = run_market_sensitivity_metrics(
-        prices, ticker, start_date, end_date
-    )
+    return analysis
 
-    stability_results = run_stability_metrics(
-        prices, ticker, start_date, end_date
-    )
 
-    investment_results = run_investment_simulation(
-        prices, ticker, start_date, end_date,
-        initial_capital=initial_capital
-    )
+def run_full_analysis(
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    initial_capital: float = 100_000,
+    use_cache: bool = False,
+    max_workers: int = None,
+    market_ticker: str = "^GSPC",
+    metrics=None
+):
+    """
+    max_workers > 1 downloads the market_ticker benchmark while the stock
+    loads and runs the pipelines concurrently (see analyze_prices).
+    metrics → extra registered metrics to add (see analyze_prices).
+    """
 
-    # ✅ NEW: Drawdown Events
-    drawdown_results = run_drawdown_events(
-        prices,
-        ticker,
-        start_date,
-        end_date,
-        use_llm=False   # keep off unless needed
-    )
+    # -------------------------------------
+    # Load Data
+    # -------------------------------------
+    prefetch = None
+    if max_workers and max_workers > 1:
+        # Warms the shared benchmark cache used by the market pipeline
+        prefetch = ThreadPoolExecutor(max_workers=1)
+        benchmark = prefetch.submit(get_benchmark, market_ticker, start_date, end_date)
+
+    try:
+        prices = load_price_data(
+            ticker=ticker,
+            start=start_date,
+            end=end_date
+        )
+    finally:
+        if prefetch is not None:
+            prefetch.shutdown(wait=False)
 
     # -------------------------------------
-    # Build Structured Chatbot Context
+    # Load From Cache
     # -------------------------------------
+    # Keyed by ticker, dates, price data, parameters and code version,
+    # so a stale entry is never hit
+    if use_cache:
+        key = cache_key(
+            ticker, start_date, end_date, prices,
+            params={
+                "initial_capital": initial_capital,
+                "market_ticker": market_ticker,
+                "metrics": list(metrics or [])
+            }
+        )
+        cached = load_analysis(key)
+
+        if cached is not None:
+            print("⚡ Loading analysis from cache...")
+            return cached
 
-    context = {
-        "ticker": ticker,
-        "start_date": start_date,
-        "end_date": end_date,
-        "growth": growth_results,
-        "risk": risk_results,
-        "risk_adjusted": risk_adjusted_results,
-        "tail_risk": tail_risk_results,
-        "market_sensitivity": market_results,
-        "stability": stability_results,
-        "investment_simulation": investment_results,
-        "drawdown_events": drawdown_results   # ✅ added here
-    }
+    print("📊 Running fresh analysis...")
+
+    if prefetch is not None:
+        benchmark.result()
+
+    context = analyze_prices(
+        prices, ticker, start_date, end_date,
+        initial_capital=initial_capital,
+        max_workers=max_workers,
+        market_ticker=market_ticker,
+        metrics=metrics
+    )
 
     # -------------------------------------
     # Save Cache
     # -------------------------------------
 
     if use_cache:
-        with open(cache_file, "w") as f:
-            json.dump(context, f, indent=2, default=str)
+        save_analysis(key, context)
         print("💾 Context saved to cache.")
 
     return context
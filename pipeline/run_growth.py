@@ -1,9 +1,12 @@
 # pipeline/run_growth.py
 
+from engine.analysis_context import AnalysisContext
 from engine.growth import total_return, cagr
+from engine.holding_period import DEFAULT_HOLDING_PERIODS, holding_period_matrix
 from visuals.growth_plots import (
     plot_price_series,
-    plot_cumulative_returns
+    plot_cumulative_returns,
+    plot_holding_period_heatmap
 )
 from chat.event_explainer import explain_event_with_llm
 
@@ -15,7 +18,9 @@ def run_growth_metrics(
     end_date: str,
     use_llm: bool = False,
     use_visuals: bool = True,
-    verbose: bool = False
+    verbose: bool = False,
+    holding_periods=None,
+    context: AnalysisContext = None
 ):
     """
     Growth Metrics Pipeline (Professional Version)
@@ -24,7 +29,16 @@ def run_growth_metrics(
     - verbose → print metrics
     - use_visuals → show charts
     - use_llm → generate explanation
+
+    holding_periods → also build the start date x holding period matrix
+    of total return, CAGR and max drawdown (list of periods in trading
+    days, or "all" for every period) in one pass, instead of rerunning
+    the analysis per date range. The summary covers the listed periods
+    (the standard horizons for "all").
+
+    context → shared AnalysisContext (built from prices if omitted)
     """
+    context = context or AnalysisContext(prices)
 
     # -------------------------
     # 1️⃣ Compute growth metrics
@@ -44,6 +58,37 @@ def run_growth_metrics(
         "cagr": f"{cagr_value:.2%}"
     }
 
+    holding_periods_matrix = None
+
+    if holding_periods is not None:
+        full_range = isinstance(holding_periods, str) and holding_periods == "all"
+        holding_periods_matrix = holding_period_matrix(
+            prices,
+            None if full_range else holding_periods
+        )
+
+        summary_periods = DEFAULT_HOLDING_PERIODS if full_range else holding_periods
+        period_returns = holding_periods_matrix["total_return"]
+
+        raw_outputs["holding_period_returns"] = {
+            f"{period}d": {
+                "mean": period_returns[period].mean(),
+                "min": period_returns[period].min(),
+                "max": period_returns[period].max(),
+                "loss_probability": (period_returns[period].dropna() < 0).mean()
+            }
+            for period in summary_periods
+            if period in period_returns.columns and period_returns[period].notna().any()
+        }
+
+        formatted_outputs["holding_period_returns"] = {
+            period: (
+                f"{stats['mean']:.2%} avg / {stats['min']:.2%} worst / "
+                f"{stats['max']:.2%} best / {stats['loss_probability']:.0%} chance of loss"
+            )
+            for period, stats in raw_outputs["holding_period_returns"].items()
+        }
+
     # -------------------------
     # 2️⃣ Print metrics (optional)
     # -------------------------
@@ -75,7 +120,10 @@ def run_growth_metrics(
     # -------------------------
     if use_visuals:
         plot_price_series(prices, ticker)
-        plot_cumulative_returns(prices, ticker)
+        plot_cumulative_returns(prices, ticker, cumulative_returns=context.cumulative_returns)
+
+        if holding_periods_matrix is not None:
+            plot_holding_period_heatmap(holding_periods_matrix["cagr"], ticker)
 
     # -------------------------
     # 5️⃣ Return structured result
@@ -83,5 +131,8 @@ def run_growth_metrics(
     return {
         "raw": raw_outputs,
         "formatted": formatted_outputs,
+        "series": {
+            "holding_period_matrix": holding_periods_matrix
+        },
         "explanation": growth_explanation
     }
@@ -0,0 +1,124 @@
+# pipeline/run_incremental_refresh.py
+
+import hashlib
+import json
+
+from engine.data_loader import load_price_data
+from engine.benchmark_cache import get_benchmark
+from engine.analysis_cache import code_version, load_analysis, save_analysis
+from engine.incremental import IncrementalAnalysis
+
+
+def _state_key(
+    ticker: str,
+    start_date: str,
+    market_ticker: str,
+    params: dict
+) -> str:
+    """
+    Address of the running state for a ticker and window start. The end
+    date and price data are left out so an extended window finds it.
+    """
+    payload = json.dumps(
+        {
+            "kind": "incremental",
+            "ticker": ticker,
+            "start_date": str(start_date),
+            "market_ticker": market_ticker,
+            "params": params,
+            "code": code_version()
+        },
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _state_matches(state: IncrementalAnalysis, prices, market_prices) -> bool:
+    """
+    True if the stored state was built from the same history the new data
+    starts with (same first bar, unchanged last bar seen).
+    """
+    if state.first_date is None or prices.empty:
+        return False
+
+    if prices.index[0] != state.first_date or prices.iloc[0] != state.first_price:
+        return False
+
+    if state.last_date not in prices.index or prices.loc[state.last_date] != state.last_price:
+        return False
+
+    if state.market_last_date is not None and (
+        state.market_last_date not in market_prices.index
+        or market_prices.loc[state.market_last_date] != state.market_last_price
+    ):
+        return False
+
+    return True
+
+
+def run_incremental_refresh(
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    market_ticker: str = "^GSPC",
+    rolling_window: int = 30,
+    confidence_level: float = 0.95
+) -> dict:
+    """
+    Incremental Refresh Pipeline
+
+    Daily refresh of an analysis window whose end date moves forward.
+    The running metric state saved by the previous refresh is loaded and
+    only the bars after its last date are folded in; if the history it was
+    built from has changed (revised or missing bars) it is rebuilt from
+    scratch. Stock and benchmark are expected to be refreshed to the same
+    end date.
+
+    Returns the pipelines' raw metrics plus the drawdown events table.
+    """
+
+    # -------------------------
+    # 1️⃣ Load prices and benchmark
+    # -------------------------
+    prices = load_price_data(ticker=ticker, start=start_date, end=end_date)
+    market_prices, _ = get_benchmark(market_ticker, start_date, end_date)
+
+    # -------------------------
+    # 2️⃣ Load running state
+    # -------------------------
+    params = {
+        "rolling_window": rolling_window,
+        "confidence_level": confidence_level
+    }
+    key = _state_key(ticker, start_date, market_ticker, params)
+    stored = load_analysis(key)
+
+    state = None if stored is None else IncrementalAnalysis.from_dict(stored)
+
+    if state is None or not _state_matches(state, prices, market_prices):
+        print("📊 Building incremental state from full history...")
+        state = IncrementalAnalysis(
+            rolling_window=rolling_window,
+            confidence_level=confidence_level
+        )
+    else:
+        print("⚡ Folding new bars into cached state...")
+
+    # -------------------------
+    # 3️⃣ Fold new bars and save
+    # -------------------------
+    state.update(prices, market_prices)
+    save_analysis(key, state.to_dict())
+
+    # -------------------------
+    # 4️⃣ Return metrics
+    # -------------------------
+    metrics = state.metrics()
+    metrics["market_sensitivity"]["market_ticker"] = market_ticker
+
+    return {
+        "ticker": ticker,
+        "start_date": start_date,
+        "end_date": end_date,
+        **metrics
+    }
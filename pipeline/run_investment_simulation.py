@@ -1,6 +1,11 @@
 # pipeline/run_investment_simulation.py
 
-from engine.investment_simulator import simulate_investment
+import numpy as np
+import pandas as pd
+
+from engine.analysis_context import AnalysisContext
+from engine.portfolio_simulator import simulate_portfolio
+from engine.monte_carlo import simulate_paths, summarize_paths
 from visuals.investment_plots import (
     plot_portfolio_value,
     plot_portfolio_value_with_extremes,
@@ -16,9 +21,19 @@ def run_investment_simulation(
     start_date: str,
     end_date: str,
     initial_capital: float = 100_000,
+    weights: dict = None,
+    rebalance_frequency: str = None,
+    contribution: float = 0.0,
+    contribution_frequency: str = "M",
+    transaction_cost: float = 0.0,
+    monte_carlo_paths: int = 0,
+    monte_carlo_method: str = "bootstrap",
+    monte_carlo_horizon: int = 252,
+    monte_carlo_workers: int = None,
     use_llm: bool = False,
     use_visuals: bool = False,
-    verbose: bool = False
+    verbose: bool = False,
+    context: AnalysisContext = None
 ):
     """
     Investment Simulation Pipeline (Professional Version)
@@ -27,16 +42,62 @@ def run_investment_simulation(
     - verbose → print metrics
     - use_visuals → show charts
     - use_llm → generate explanation
+
+    prices may be a single series or a price panel (one column per asset).
+    weights / rebalance_frequency / contribution / contribution_frequency /
+    transaction_cost → portfolio options of engine.portfolio_simulator
+    (defaults replay a single lump-sum investment)
+
+    monte_carlo_paths → also simulate that many future paths of
+    monte_carlo_horizon days from the final value ("bootstrap", "gbm" or
+    "student_t"; 0 disables)
+
+    context → shared AnalysisContext of a single price series. Only a
+    plain buy-and-hold (no contributions or costs) has the asset's own
+    returns, so only then are context.returns reused for Monte Carlo;
+    other portfolios are simulated from their own flow-free returns.
     """
 
     # -------------------------
     # 1️⃣ Simulate investment
     # -------------------------
-    investment_stats = simulate_investment(
+    investment_stats = simulate_portfolio(
         prices,
-        initial_capital
+        initial_capital,
+        weights=weights,
+        rebalance_frequency=rebalance_frequency,
+        contribution=contribution,
+        contribution_frequency=contribution_frequency,
+        transaction_cost=transaction_cost
     )
 
+    monte_carlo = None
+
+    if monte_carlo_paths:
+        buy_and_hold = isinstance(prices, pd.Series) and not contribution and not transaction_cost
+
+        if buy_and_hold:
+            # Same log returns as the asset itself
+            context = context or AnalysisContext(prices)
+            portfolio_returns = context.returns
+        else:
+            portfolio_series = investment_stats["portfolio_series"]
+
+            # Flow-free daily log returns of the portfolio
+            portfolio_returns = np.log1p(
+                investment_stats["daily_pnl"] / portfolio_series.shift(1)
+            ).dropna()
+
+        paths = simulate_paths(
+            portfolio_returns,
+            investment_stats["final_value"],
+            n_paths=monte_carlo_paths,
+            n_steps=monte_carlo_horizon,
+            method=monte_carlo_method,
+            workers=monte_carlo_workers
+        )
+        monte_carlo = summarize_paths(paths, investment_stats["final_value"])
+
     # -------------------------
     # 2️⃣ Prepare structured outputs
     # -------------------------
@@ -53,8 +114,13 @@ def run_investment_simulation(
         "max_daily_gain_date": investment_stats["max_daily_gain_date"],
         "max_daily_loss": investment_stats["max_daily_loss"],
         "max_daily_loss_date": investment_stats["max_daily_loss_date"],
+        "total_contributions": investment_stats["total_contributions"],
+        "total_costs": investment_stats["total_costs"]
     }
 
+    if monte_carlo is not None:
+        raw_outputs["monte_carlo"] = monte_carlo
+
     # Formatted values (for LLM prompt / display)
     formatted_outputs = {
         "initial_investment": f"{investment_stats['initial_investment']:.2f}",
@@ -66,9 +132,19 @@ def run_investment_simulation(
         "largest_daily_gain": f"{investment_stats['max_daily_gain']:.2f}",
         "largest_daily_gain_date": investment_stats["max_daily_gain_date"].date().isoformat(),
         "largest_daily_loss": f"{investment_stats['max_daily_loss']:.2f}",
-        "largest_daily_loss_date": investment_stats["max_daily_loss_date"].date().isoformat()
+        "largest_daily_loss_date": investment_stats["max_daily_loss_date"].date().isoformat(),
+        "total_contributions": f"{investment_stats['total_contributions']:.2f}",
+        "total_costs": f"{investment_stats['total_costs']:.2f}"
     }
 
+    if monte_carlo is not None:
+        final_values = monte_carlo["final_value"]
+        formatted_outputs["monte_carlo_final_value_range"] = (
+            f"{final_values['p5']:.2f} – {final_values['p95']:.2f} "
+            f"(median {final_values['p50']:.2f}) after {monte_carlo_horizon} days"
+        )
+        formatted_outputs["monte_carlo_probability_of_loss"] = f"{monte_carlo['probability_of_loss']:.1%}"
+
     # -------------------------
     # 3️⃣ Optional printing
     # -------------------------
@@ -78,6 +154,10 @@ def run_investment_simulation(
         print(f"Initial Investment: {raw_outputs['initial_investment']:.2f}")
         print(f"Final Value: {raw_outputs['final_value']:.2f}")
 
+        if raw_outputs["total_contributions"] or raw_outputs["total_costs"]:
+            print(f"Contributions: {raw_outputs['total_contributions']:.2f}")
+            print(f"Transaction Costs: {raw_outputs['total_costs']:.2f}")
+
         print(
             f"Lowest Value: {raw_outputs['min_value']:.2f} "
             f"on {raw_outputs['min_value_date'].date()}"
@@ -98,6 +178,13 @@ def run_investment_simulation(
             f"on {raw_outputs['max_daily_loss_date'].date()}"
         )
 
+        if monte_carlo is not None:
+            print(
+                f"Monte Carlo ({monte_carlo_paths} paths, {monte_carlo_method}): "
+                f"{formatted_outputs['monte_carlo_final_value_range']}, "
+                f"probability of loss {formatted_outputs['monte_carlo_probability_of_loss']}"
+            )
+
     # -------------------------
     # 4️⃣ Optional LLM explanation
     # -------------------------
@@ -135,7 +222,8 @@ def run_investment_simulation(
             portfolio_series,
             investment_stats["max_daily_gain_date"],
             investment_stats["max_daily_loss_date"],
-            ticker
+            ticker,
+            daily_pnl=investment_stats["daily_pnl"]
         )
 
         plot_drawdown_in_currency(
@@ -1,9 +1,17 @@
 # pipeline/run_market_sensitivity.py
 
-from engine.data_loader import load_price_data
-from engine.returns import compute_log_returns
-from engine.market import market_metrics
-from visuals.market_plots import plot_stock_vs_market
+import numpy as np
+import pandas as pd
+
+from engine.benchmark_cache import get_benchmark
+from engine.analysis_context import AnalysisContext
+from engine.market import (
+    market_metrics,
+    rolling_market_metrics,
+    ewma_market_metrics
+)
+from engine.factors import load_factor_returns, factor_regression
+from visuals.market_plots import plot_stock_vs_market, plot_rolling_beta
 from chat.event_explainer import explain_event_with_llm
 
 
@@ -13,35 +21,45 @@ def run_market_sensitivity_metrics(
     start_date: str,
     end_date: str,
     market_ticker: str = "^GSPC",
+    rolling_window: int = 60,
+    ewma_halflife: float = 60,
+    factor_set: str = None,
     use_llm: bool = False,
     use_visuals: bool = False,
-    verbose: bool = False
+    verbose: bool = False,
+    context: AnalysisContext = None
 ):
     """
     Market Sensitivity Pipeline (Professional Version)
 
     Flags:
     - verbose → print metrics
-    - use_visuals → show regression plot
+    - use_visuals → show regression and rolling beta plots
     - use_llm → generate explanation
+
+    rolling_window / ewma_halflife → rolling and EWMA beta, alpha, R² series
+    factor_set → also regress on the market plus the factors of a local
+    factor file (engine.factors.FACTOR_DIR/{factor_set}.csv); this
+    regression uses simple returns, like the factor file
+
+    context → shared AnalysisContext (built from prices if omitted)
     """
 
     # -------------------------
     # 1️⃣ Compute stock returns
     # -------------------------
-    stock_returns = compute_log_returns(prices)
+    context = context or AnalysisContext(prices)
+    stock_returns = context.returns
 
     # -------------------------
-    # 2️⃣ Load market data
+    # 2️⃣ Load market data (shared benchmark cache)
     # -------------------------
-    market_prices = load_price_data(
-        ticker=market_ticker,
-        start=start_date,
-        end=end_date
+    _, market_returns = get_benchmark(
+        market_ticker,
+        start_date,
+        end_date
     )
 
-    market_returns = compute_log_returns(market_prices)
-
     # -------------------------
     # 3️⃣ Compute metrics
     # -------------------------
@@ -54,6 +72,35 @@ def run_market_sensitivity_metrics(
     alpha_annual = market_stats["Alpha"]
     r_squared = market_stats["R2"]
 
+    rolling_stats = rolling_market_metrics(
+        stock_returns,
+        market_returns,
+        window=rolling_window
+    )
+
+    ewma_stats = ewma_market_metrics(
+        stock_returns,
+        market_returns,
+        halflife=ewma_halflife
+    )
+
+    factor_stats = None
+
+    if factor_set is not None:
+        # Factor files hold simple returns; convert the log returns to match
+        factor_returns = pd.concat(
+            [
+                np.expm1(market_returns).rename(market_ticker),
+                load_factor_returns(factor_set, start_date, end_date)
+            ],
+            axis=1,
+            join="inner"
+        )
+        factor_stats = factor_regression(
+            np.expm1(stock_returns).rename(ticker),
+            factor_returns
+        )
+
     # -------------------------
     # 4️⃣ Prepare structured outputs
     # -------------------------
@@ -66,6 +113,12 @@ def run_market_sensitivity_metrics(
         "market_ticker": market_ticker
     }
 
+    if factor_stats is not None:
+        raw_outputs["factor_set"] = factor_set
+        raw_outputs["factor_loadings"] = factor_stats["loadings"].loc[ticker].to_dict()
+        raw_outputs["factor_t_stats"] = factor_stats["t_stats"].loc[ticker].to_dict()
+        raw_outputs["factor_r_squared"] = factor_stats["r_squared"].loc[ticker]
+
     # Formatted values (for LLM prompt)
     formatted_outputs = {
         "beta": f"{beta:.2f}",
@@ -74,6 +127,13 @@ def run_market_sensitivity_metrics(
         "market_ticker": market_ticker
     }
 
+    if factor_stats is not None:
+        formatted_outputs["factor_loadings"] = {
+            name: f"{value:.2f} (t={raw_outputs['factor_t_stats'][name]:.1f})"
+            for name, value in raw_outputs["factor_loadings"].items()
+        }
+        formatted_outputs["factor_r_squared"] = f"{raw_outputs['factor_r_squared']:.2f}"
+
     # -------------------------
     # 5️⃣ Optional printing
     # -------------------------
@@ -95,6 +155,12 @@ def run_market_sensitivity_metrics(
             "(Higher R² → stock movement strongly explained by market)\n"
         )
 
+        if factor_stats is not None:
+            print(f"Factor Loadings ({factor_set}):")
+            for name, value in formatted_outputs["factor_loadings"].items():
+                print(f"  {name}: {value}")
+            print(f"Factor R²: {formatted_outputs['factor_r_squared']}\n")
+
     # -------------------------
     # 6️⃣ Optional LLM explanation
     # -------------------------
@@ -124,11 +190,23 @@ def run_market_sensitivity_metrics(
             market_ticker=market_ticker
         )
 
+        plot_rolling_beta(
+            rolling_stats,
+            ewma_stats,
+            stock_ticker=ticker,
+            market_ticker=market_ticker,
+            window=rolling_window
+        )
+
     # -------------------------
     # 8️⃣ Return structured result
     # -------------------------
     return {
         "raw": raw_outputs,
         "formatted": formatted_outputs,
+        "series": {
+            "rolling": rolling_stats,
+            "ewma": ewma_stats
+        },
         "explanation": market_explanation
     }
@@ -1,10 +1,9 @@
 # pipeline/run_risk.py
 
-from engine.returns import compute_log_returns
+from engine.analysis_context import AnalysisContext
 from engine.risk import (
     annualized_volatility,
-    downside_volatility,
-    max_drawdown
+    downside_volatility
 )
 from visuals.risk_plots import (
     plot_returns,
@@ -22,7 +21,8 @@ def run_risk_metrics(
     rolling_window: int = 30,
     use_llm: bool = False,
     use_visuals: bool = False,
-    verbose: bool = False
+    verbose: bool = False,
+    context: AnalysisContext = None
 ):
     """
     Risk Metrics Pipeline (Unified Professional Version)
@@ -31,19 +31,22 @@ def run_risk_metrics(
     - verbose → print metrics
     - use_visuals → show plots
     - use_llm → generate explanation
+
+    context → shared AnalysisContext (built from prices if omitted)
     """
 
     # -------------------------
     # 1️⃣ Compute Returns
     # -------------------------
-    returns = compute_log_returns(prices)
+    context = context or AnalysisContext(prices)
+    returns = context.returns
 
     # -------------------------
     # 2️⃣ Compute Risk Metrics
     # -------------------------
     vol = annualized_volatility(returns)
-    down_vol = downside_volatility(returns)
-    mdd = max_drawdown(prices)
+    down_vol = downside_volatility(returns, downside_returns=context.downside_returns)
+    mdd = context.max_drawdown
 
     # -------------------------
     # 3️⃣ Prepare Structured Outputs
@@ -83,10 +86,11 @@ def run_risk_metrics(
         plot_rolling_volatility(
             returns,
             ticker,
-            window=rolling_window
+            window=rolling_window,
+            rolling_vol=context.rolling_surface([rolling_window])["volatility"][rolling_window]
         )
 
-        plot_drawdown(prices, ticker)
+        plot_drawdown(prices, ticker, drawdown=context.drawdown)
 
     # -------------------------
     # 6️⃣ Optional LLM Explanation
@@ -1,11 +1,12 @@
 # pipeline/run_risk_adjusted.py
 
-from engine.returns import compute_log_returns
+from engine.analysis_context import AnalysisContext
 from engine.risk_adjusted import (
     sharpe_ratio,
     sortino_ratio,
     calmar_ratio
 )
+from engine.bootstrap import bootstrap_confidence_intervals
 from visuals.risk_adjusted_plots import (
     plot_rolling_sharpe,
     show_risk_adjusted_summary,
@@ -21,9 +22,12 @@ def run_risk_adjusted_metrics(
     start_date: str,
     end_date: str,
     rolling_window: int = 30,
+    bootstrap_samples: int = 0,
+    bootstrap_workers: int = None,
     use_llm: bool = False,
     use_visuals: bool = False,
-    verbose: bool = False
+    verbose: bool = False,
+    context: AnalysisContext = None
 ):
     """
     Risk-Adjusted Metrics Pipeline (Professional Version)
@@ -32,19 +36,25 @@ def run_risk_adjusted_metrics(
     - verbose → print metrics
     - use_visuals → show plots
     - use_llm → generate explanation
+
+    bootstrap_samples → stationary bootstrap resamples for 95% CIs
+    (0 disables; bootstrap_workers > 1 uses a process pool)
+
+    context → shared AnalysisContext (built from prices if omitted)
     """
 
     # -------------------------
     # 1️⃣ Compute returns
     # -------------------------
-    returns = compute_log_returns(prices)
+    context = context or AnalysisContext(prices)
+    returns = context.returns
 
     # -------------------------
     # 2️⃣ Compute metrics
     # -------------------------
     sharpe = sharpe_ratio(returns)
-    sortino = sortino_ratio(returns)
-    calmar = calmar_ratio(prices)
+    sortino = sortino_ratio(returns, downside_returns=context.downside_returns)
+    calmar = calmar_ratio(prices, drawdowns=context.drawdown)
 
     # -------------------------
     # 3️⃣ Prepare structured outputs
@@ -58,6 +68,16 @@ def run_risk_adjusted_metrics(
         "rolling_window_days": rolling_window
     }
 
+    if bootstrap_samples:
+        intervals = bootstrap_confidence_intervals(
+            returns,
+            metrics=("sharpe_ratio", "sortino_ratio"),
+            n_samples=bootstrap_samples,
+            workers=bootstrap_workers
+        )
+        for name, bounds in intervals.items():
+            raw_outputs[f"{name}_ci"] = bounds
+
     # Formatted values (for LLM prompt)
     formatted_outputs = {
         "sharpe_ratio": f"{sharpe:.2f}",
@@ -95,7 +115,8 @@ def run_risk_adjusted_metrics(
         plot_rolling_sharpe(
             returns,
             ticker,
-            window=rolling_window
+            window=rolling_window,
+            rolling_sharpe=context.rolling_surface([rolling_window])["sharpe"][rolling_window]
         )
 
         show_risk_adjusted_summary(
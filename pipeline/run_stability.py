@@ -1,15 +1,15 @@
 # pipeline/run_stability.py
 
-from engine.returns import compute_log_returns
+from engine.analysis_context import AnalysisContext
 from engine.stability import (
-    rolling_sharpe,
     max_drawdown_duration,
     recovery_time,
     drawdown_duration
 )
 from visuals.stability_plots import (
     plot_rolling_sharpe,
-    plot_drawdown_duration
+    plot_drawdown_duration,
+    plot_rolling_sharpe_surface
 )
 from chat.event_explainer import explain_event_with_llm
 
@@ -20,9 +20,11 @@ def run_stability_metrics(
     start_date: str,
     end_date: str,
     rolling_window: int = 30,
+    rolling_windows: list = None,
     use_llm: bool = False,
     use_visuals: bool = False,
-    verbose: bool = False
+    verbose: bool = False,
+    context: AnalysisContext = None
 ):
     """
     Stability Metrics Pipeline (Unified Professional Version)
@@ -31,30 +33,39 @@ def run_stability_metrics(
     - verbose → print metrics
     - use_visuals → show plots
     - use_llm → generate explanation
+
+    rolling_windows → also report rolling Sharpe for several windows
+    (e.g. [21, 63, 126, 252]); every window, rolling_window included,
+    comes from the context's shared rolling surface
+
+    context → shared AnalysisContext (built from prices if omitted)
     """
 
     # -------------------------
     # 1️⃣ Compute Returns
     # -------------------------
-    returns = compute_log_returns(prices)
+    context = context or AnalysisContext(prices)
+    returns = context.returns
 
     # -------------------------
     # 2️⃣ Compute Stability Metrics
     # -------------------------
-    rolling_sharpe_series = rolling_sharpe(
-        returns,
-        window=rolling_window
-    )
+    sharpe_surface = context.rolling_surface([rolling_window] + list(rolling_windows or []))["sharpe"]
+    rolling_sharpe_series = sharpe_surface[rolling_window].rename(returns.name)
 
-    max_dd_duration = max_drawdown_duration(prices)
-    recovery_days = recovery_time(prices)
-    dd_duration_series = drawdown_duration(prices)
+    max_dd_duration = max_drawdown_duration(prices, context.drawdown)
+    recovery_days = recovery_time(prices, context.drawdown)
+    dd_duration_series = drawdown_duration(prices, context.drawdown)
 
     # Safe rolling stats (avoid NaN issues)
     rolling_mean = rolling_sharpe_series.mean()
     rolling_min = rolling_sharpe_series.min()
     rolling_max = rolling_sharpe_series.max()
 
+    surface = None
+    if rolling_windows:
+        surface = sharpe_surface[list(dict.fromkeys(rolling_windows))]
+
     # -------------------------
     # 3️⃣ Prepare Structured Outputs
     # -------------------------
@@ -69,6 +80,16 @@ def run_stability_metrics(
         "rolling_sharpe_max": rolling_max
     }
 
+    if surface is not None:
+        raw_outputs["rolling_sharpe_surface"] = {
+            f"{window}d": {
+                "mean": surface[window].mean(),
+                "min": surface[window].min(),
+                "max": surface[window].max()
+            }
+            for window in rolling_windows
+        }
+
     # Formatted values (for LLM)
     formatted_outputs = {
         "max_drawdown_duration_days": f"{max_dd_duration}",
@@ -79,6 +100,12 @@ def run_stability_metrics(
         "rolling_sharpe_max": f"{rolling_max:.2f}"
     }
 
+    if surface is not None:
+        formatted_outputs["rolling_sharpe_surface"] = {
+            window: f"{stats['mean']:.2f} / {stats['min']:.2f} / {stats['max']:.2f}"
+            for window, stats in raw_outputs["rolling_sharpe_surface"].items()
+        }
+
     # -------------------------
     # 4️⃣ Optional Printing
     # -------------------------
@@ -100,6 +127,10 @@ def run_stability_metrics(
             f"{rolling_mean:.2f} / {rolling_min:.2f} / {rolling_max:.2f}"
         )
 
+        if surface is not None:
+            for window, summary in formatted_outputs["rolling_sharpe_surface"].items():
+                print(f"Rolling Sharpe {window} (mean/min/max): {summary}")
+
     # -------------------------
     # 5️⃣ Optional Visualizations
     # -------------------------
@@ -115,6 +146,9 @@ def run_stability_metrics(
             ticker
         )
 
+        if surface is not None:
+            plot_rolling_sharpe_surface(surface, ticker)
+
     # -------------------------
     # 6️⃣ Optional LLM Explanation
     # -------------------------
@@ -141,7 +175,8 @@ def run_stability_metrics(
         "formatted": formatted_outputs,
         "series": {
             "rolling_sharpe": rolling_sharpe_series,
-            "drawdown_duration": dd_duration_series
+            "drawdown_duration": dd_duration_series,
+            "rolling_sharpe_surface": surface
         },
         "explanation": stability_explanation
     }
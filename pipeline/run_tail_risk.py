@@ -1,12 +1,14 @@
 # pipeline/run_tail_risk.py
 
-from engine.returns import compute_log_returns
+from engine.analysis_context import AnalysisContext
 from engine.tail_risk import (
     skewness,
     kurtosis_excess,
     value_at_risk,
-    conditional_value_at_risk
+    conditional_value_at_risk,
+    sketch_tail_risk
 )
+from engine.bootstrap import bootstrap_confidence_intervals
 from visuals.tail_risk_plots import plot_return_distribution
 from chat.event_explainer import explain_event_with_llm
 
@@ -17,9 +19,14 @@ def run_tail_risk_metrics(
     start_date: str,
     end_date: str,
     confidence_level: float = 0.95,
+    var_method: str = "exact",
+    sketch_k: int = 200,
+    bootstrap_samples: int = 0,
+    bootstrap_workers: int = None,
     use_llm: bool = False,
     use_visuals: bool = False,
-    verbose: bool = False
+    verbose: bool = False,
+    context: AnalysisContext = None
 ):
     """
     Tail Risk Pipeline (Professional Version)
@@ -28,20 +35,43 @@ def run_tail_risk_metrics(
     - verbose → print metrics
     - use_visuals → show charts
     - use_llm → generate explanation
+
+    var_method → "exact" (full sorted history) or "sketch" (KLL quantile
+    sketch with accuracy parameter sketch_k; bounded memory, reports its
+    rank error bound)
+
+    bootstrap_samples → stationary bootstrap resamples for 95% CIs
+    (0 disables; bootstrap_workers > 1 uses a process pool)
+
+    context → shared AnalysisContext (built from prices if omitted)
     """
 
     # -------------------------
     # 1️⃣ Compute returns
     # -------------------------
-    returns = compute_log_returns(prices)
+    context = context or AnalysisContext(prices)
+    returns = context.returns
 
     # -------------------------
     # 2️⃣ Compute tail risk metrics
     # -------------------------
     skew_val = skewness(returns)
     kurt_val = kurtosis_excess(returns)
-    var_val = value_at_risk(returns, confidence_level)
-    cvar_val = conditional_value_at_risk(returns, confidence_level)
+    sketch_stats = None
+
+    if var_method == "exact":
+        var_val = value_at_risk(
+            returns, confidence_level, sorted_returns=context.sorted_returns
+        )
+        cvar_val = conditional_value_at_risk(
+            returns, confidence_level, sorted_returns=context.sorted_returns
+        )
+    elif var_method == "sketch":
+        sketch_stats = sketch_tail_risk(returns.values, confidence_level, k=sketch_k)
+        var_val = sketch_stats["value_at_risk"]
+        cvar_val = sketch_stats["conditional_value_at_risk"]
+    else:
+        raise ValueError(f"Unknown var_method: {var_method}")
 
     confidence_pct = int(confidence_level * 100)
 
@@ -55,9 +85,25 @@ def run_tail_risk_metrics(
         "kurtosis_excess": kurt_val,
         "value_at_risk": var_val,
         "conditional_value_at_risk": cvar_val,
-        "confidence_level": confidence_level
+        "confidence_level": confidence_level,
+        "var_method": var_method
     }
 
+    if sketch_stats is not None:
+        raw_outputs["var_rank_error"] = sketch_stats["rank_error"]
+        raw_outputs["var_bounds"] = (sketch_stats["var_lower"], sketch_stats["var_upper"])
+
+    if bootstrap_samples:
+        intervals = bootstrap_confidence_intervals(
+            returns,
+            metrics=("value_at_risk", "conditional_value_at_risk", "skewness"),
+            n_samples=bootstrap_samples,
+            workers=bootstrap_workers,
+            confidence_level=confidence_level
+        )
+        for name, bounds in intervals.items():
+            raw_outputs[f"{name}_ci"] = bounds
+
     # Formatted values (for LLM prompts)
     formatted_outputs = {
         "skewness": f"{skew_val:.2f}",
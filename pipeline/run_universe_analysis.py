@@ -0,0 +1,165 @@
+# pipeline/run_universe_analysis.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from engine.benchmark_cache import get_benchmark, get_benchmark_cache
+from engine.data_loader import load_price_panel
+from pipeline.run_full_analysis import analyze_prices
+
+
+# Per-worker state set up once by _init_worker
+_WORKER = {}
+
+
+def _share_array(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, dict]:
+    """
+    Copy an array into a new shared memory block and describe how to attach to it.
+    """
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+
+    return block, {
+        "name": block.name,
+        "shape": array.shape,
+        "dtype": array.dtype.str
+    }
+
+
+def _attach_array(spec: dict) -> np.ndarray:
+    block = shared_memory.SharedMemory(name=spec["name"])
+    _WORKER.setdefault("blocks", []).append(block)   # keep the mapping alive
+    return np.ndarray(spec["shape"], dtype=np.dtype(spec["dtype"]), buffer=block.buf)
+
+
+def _init_worker(spec: dict):
+    """
+    Attach to the shared price panel and benchmark, and seed the
+    worker's benchmark cache so no worker downloads the benchmark again.
+    """
+    _WORKER["market_ticker"] = spec["market_ticker"]
+    _WORKER["columns"] = {ticker: j for j, ticker in enumerate(spec["tickers"])}
+    _WORKER["dates"] = _attach_array(spec["dates"])
+    _WORKER["panel"] = _attach_array(spec["panel"])
+
+    market_prices = pd.Series(
+        _attach_array(spec["market_values"]),
+        index=pd.DatetimeIndex(_attach_array(spec["market_dates"]), name="Date"),
+        name=spec["market_ticker"]
+    )
+
+    get_benchmark_cache().put(
+        spec["market_ticker"],
+        spec["start_date"],
+        spec["end_date"],
+        market_prices
+    )
+
+
+def _analyze_ticker(
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    initial_capital: float
+) -> dict:
+    column = _WORKER["panel"][:, _WORKER["columns"][ticker]]
+    traded = ~np.isnan(column)
+
+    if not traded.any():
+        raise ValueError(f"No price data for {ticker}.")
+
+    prices = pd.Series(
+        column[traded],
+        index=pd.DatetimeIndex(_WORKER["dates"][traded], name="Date"),
+        name=ticker
+    )
+
+    return analyze_prices(
+        prices, ticker, start_date, end_date,
+        initial_capital=initial_capital,
+        use_visuals=False,
+        market_ticker=_WORKER["market_ticker"]
+    )
+
+
+def run_universe_analysis(
+    tickers: List[str],
+    start_date: str,
+    end_date: str,
+    workers: Optional[int] = None,
+    initial_capital: float = 100_000,
+    market_ticker: str = "^GSPC"
+) -> Iterator[Tuple[str, Optional[dict], Optional[BaseException]]]:
+    """
+    Universe Analysis Pipeline
+
+    Runs the full analysis for many tickers on a process pool and yields
+    (ticker, result, error) as each ticker completes. A failing ticker
+    yields its exception instead of aborting the batch.
+
+    The price panel and the benchmark are loaded once in the parent and
+    handed to workers through shared memory rather than pickled per task.
+    """
+
+    # -------------------------
+    # 1️⃣ Load panel and benchmark once
+    # -------------------------
+    tickers = list(dict.fromkeys(tickers))
+    panel = load_price_panel(tickers, start_date, end_date)
+    market_prices, _ = get_benchmark(market_ticker, start_date, end_date)
+
+    blocks = []
+    spec = {
+        "tickers": tickers,
+        "market_ticker": market_ticker,
+        "start_date": start_date,
+        "end_date": end_date
+    }
+
+    try:
+        # -------------------------
+        # 2️⃣ Publish arrays in shared memory
+        # -------------------------
+        arrays = {
+            "panel": np.ascontiguousarray(panel.to_numpy(dtype=np.float64)),
+            "dates": panel.index.values.astype("datetime64[ns]"),
+            "market_values": market_prices.to_numpy(dtype=np.float64),
+            "market_dates": market_prices.index.values.astype("datetime64[ns]")
+        }
+
+        for key, array in arrays.items():
+            block, spec[key] = _share_array(array)
+            blocks.append(block)
+
+        # -------------------------
+        # 3️⃣ Fan out and stream results
+        # -------------------------
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(spec,)
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _analyze_ticker, ticker, start_date, end_date, initial_capital
+                ): ticker
+                for ticker in tickers
+            }
+
+            try:
+                for future in as_completed(futures):
+                    error = future.exception()
+                    result = None if error is not None else future.result()
+                    yield futures[future], result, error
+            finally:
+                executor.shutdown(cancel_futures=True)
+
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from engine.analysis_cache import load_analysis, save_analysis
+from pipeline.run_growth import run_growth_metrics
+
+
+def _assert_same(actual, expected):
+    assert type(actual) is type(expected)
+
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(actual, expected)
+    elif isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(actual, expected)
+    elif isinstance(expected, dict):
+        assert list(actual) == list(expected)
+        for key in expected:
+            _assert_same(actual[key], expected[key])
+    elif isinstance(expected, (list, tuple)):
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            _assert_same(a, e)
+    elif isinstance(expected, float) and np.isnan(expected):
+        assert np.isnan(actual)
+    else:
+        assert actual == expected or (actual is pd.NaT and expected is pd.NaT)
+
+
+def test_growth_output_round_trips(tmp_path):
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range("2015-01-01", periods=600, name="Date")
+    prices = pd.Series(100 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, 600))), index=index)
+
+    result = run_growth_metrics(
+        prices, "TEST", "2015-01-01", "2017-05-01",
+        use_visuals=False,
+        holding_periods=[21, 63, 252]
+    )
+    result["extras"] = {21: pd.NaT, ("a", 1): pd.Timestamp("2016-01-04")}
+
+    save_analysis("growth", result, cache_dir=str(tmp_path))
+    cached = load_analysis("growth", cache_dir=str(tmp_path))
+
+    _assert_same(cached, result)
+    matrix = cached["series"]["holding_period_matrix"]["cagr"]
+    assert list(matrix.columns) == [21, 63, 252]
+    assert matrix.columns.name == "holding_period_days"
+
+
+def test_multiindex_columns_round_trip(tmp_path):
+    columns = pd.MultiIndex.from_product([["mean", "sharpe"], [21, 63]], names=["metric", "window"])
+    frame = pd.DataFrame(np.arange(12.0).reshape(3, 4), columns=columns)
+
+    save_analysis("frame", {"frame": frame}, cache_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(load_analysis("frame", cache_dir=str(tmp_path))["frame"], frame)
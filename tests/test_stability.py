@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from engine.market import rolling_market_metrics
+from engine.returns import compute_log_returns
+from engine.stability import rolling_sharpe, rolling_sharpe_surface
+
+
+def _prices_with_halt(n=300, halt=(100, 160), seed=1):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2010-01-01", periods=n)
+    prices = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))), index=index)
+    prices.iloc[halt[0]:halt[1]] = prices.iloc[halt[0]]
+    return prices
+
+
+def test_rolling_sharpe_surface_matches_pandas_with_flat_segment():
+    returns = compute_log_returns(_prices_with_halt())
+
+    for window in (21, 30, 63):
+        surface = rolling_sharpe_surface(returns, [window])["sharpe"][window]
+        expected = rolling_sharpe(returns, window)
+
+        assert not np.isinf(surface).any()
+        pd.testing.assert_series_equal(surface, expected, check_names=False, rtol=1e-9)
+
+
+def test_rolling_market_metrics_flat_market_has_no_beta():
+    stock = compute_log_returns(_prices_with_halt())
+    rng = np.random.default_rng(2)
+    market = pd.Series(rng.normal(0, 0.01, len(stock)), index=stock.index)
+    market.iloc[50:120] = 0.0
+
+    rolling = rolling_market_metrics(stock, market, window=30)
+
+    variance = market.rolling(30).var()
+    expected = (stock.rolling(30).cov(market) / variance).where(variance > 0)
+
+    assert not np.isinf(rolling.to_numpy()).any()
+    pd.testing.assert_series_equal(rolling["Beta"], expected, check_names=False, rtol=1e-9)
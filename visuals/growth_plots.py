@@ -13,8 +13,9 @@ def plot_price_series(prices: pd.Series, ticker: str):
     plt.show()
 
 
-def plot_cumulative_returns(prices: pd.Series, ticker: str):
-    cumulative_returns = prices / prices.iloc[0]
+def plot_cumulative_returns(prices: pd.Series, ticker: str, cumulative_returns: pd.Series = None):
+    if cumulative_returns is None:
+        cumulative_returns = prices / prices.iloc[0]
 
     plt.figure(figsize=(10, 4))
     plt.plot(cumulative_returns.index, cumulative_returns.values)
@@ -23,3 +24,36 @@ def plot_cumulative_returns(prices: pd.Series, ticker: str):
     plt.ylabel("Growth of $1")
     plt.grid(True)
     plt.show()
+
+
+def plot_holding_period_heatmap(
+    matrix: pd.DataFrame,
+    ticker: str,
+    metric: str = "CAGR"
+):
+    """
+    Heatmap of a start date x holding period matrix (holding_period_matrix).
+    """
+    values = matrix.to_numpy(dtype=np.float64)
+    limit = np.nanmax(np.abs(values)) if np.isfinite(values).any() else 1.0
+
+    plt.figure(figsize=(10, 6))
+    plt.imshow(
+        values,
+        aspect="auto",
+        interpolation="nearest",
+        cmap="RdYlGn",
+        vmin=-limit,
+        vmax=limit
+    )
+    plt.colorbar(label=metric)
+
+    x_ticks = np.linspace(0, len(matrix.columns) - 1, min(len(matrix.columns), 10)).astype(int)
+    y_ticks = np.linspace(0, len(matrix.index) - 1, min(len(matrix.index), 10)).astype(int)
+    plt.xticks(x_ticks, matrix.columns[x_ticks])
+    plt.yticks(y_ticks, matrix.index[y_ticks].strftime("%Y-%m-%d"))
+
+    plt.title(f"{ticker} {metric} by Start Date and Holding Period")
+    plt.xlabel("Holding Period (trading days)")
+    plt.ylabel("Start Date")
+    plt.show()
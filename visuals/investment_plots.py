@@ -59,12 +59,15 @@ def plot_daily_pnl(
     portfolio_series: pd.Series,
     max_gain_date,
     max_loss_date,
-    ticker: str
+    ticker: str,
+    daily_pnl: pd.Series = None
 ):
     """
     Plot daily profit/loss in absolute currency terms.
+    Pass daily_pnl when the portfolio has cash flows that are not P&L.
     """
-    daily_pnl = portfolio_series.diff()
+    if daily_pnl is None:
+        daily_pnl = portfolio_series.diff()
 
     plt.figure(figsize=(10, 4))
     plt.bar(daily_pnl.index, daily_pnl.values)
@@ -58,3 +58,33 @@ def plot_stock_vs_market(
     plt.grid(True)
     print('Steep slope → high beta (aggressive) \nFlat slope → low beta (defensive) \nTight cluster → high R² (market-driven) \nWide scatter → low R² (stock specifics \nAlpha - shows what would stock\'s price be if the market returns to 0)')
     plt.show()
+
+
+def plot_rolling_beta(
+    rolling_metrics: pd.DataFrame,
+    ewma_metrics: pd.DataFrame,
+    stock_ticker: str,
+    market_ticker: str,
+    window: int
+):
+    """
+    Rolling and EWMA beta (top) and rolling R² (bottom) over time.
+    """
+    fig, (ax_beta, ax_r2) = plt.subplots(2, 1, figsize=(10, 6), sharex=True)
+
+    ax_beta.plot(rolling_metrics.index, rolling_metrics["Beta"], label=f"{window}-Day Rolling Beta")
+    ax_beta.plot(ewma_metrics.index, ewma_metrics["Beta"], label="EWMA Beta", alpha=0.8)
+    ax_beta.axhline(1, linestyle="--", linewidth=0.8)
+    ax_beta.set_ylabel("Beta")
+    ax_beta.set_title(f"{stock_ticker} Beta vs {market_ticker}")
+    ax_beta.legend()
+    ax_beta.grid(True)
+
+    ax_r2.plot(rolling_metrics.index, rolling_metrics["R2"], color="darkred")
+    ax_r2.set_ylabel("R²")
+    ax_r2.set_xlabel("Date")
+    ax_r2.set_ylim(0, 1)
+    ax_r2.grid(True)
+
+    plt.tight_layout()
+    plt.show()
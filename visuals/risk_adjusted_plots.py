@@ -7,15 +7,16 @@ def plot_rolling_sharpe(
     returns: pd.Series,
     ticker: str,
     window: int = 30,
-    trading_days: int = 252
+    trading_days: int = 252,
+    rolling_sharpe: pd.Series = None
 ):
     """
-    Plot rolling Sharpe ratio.
+    Plot rolling Sharpe ratio (pass a precomputed series to skip recomputing it).
     """
-    rolling_mean = returns.rolling(window).mean() * trading_days
-    rolling_std = returns.rolling(window).std() * np.sqrt(trading_days)
-
-    rolling_sharpe = rolling_mean / rolling_std
+    if rolling_sharpe is None:
+        rolling_mean = returns.rolling(window).mean() * trading_days
+        rolling_std = returns.rolling(window).std() * np.sqrt(trading_days)
+        rolling_sharpe = rolling_mean / rolling_std
 
     plt.figure(figsize=(10, 4))
     plt.plot(rolling_sharpe.index, rolling_sharpe.values)
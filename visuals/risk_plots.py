@@ -18,9 +18,11 @@ def plot_rolling_volatility(
     returns: pd.Series,
     ticker: str,
     window: int = 30,
-    trading_days: int = 252
+    trading_days: int = 252,
+    rolling_vol: pd.Series = None
 ):
-    rolling_vol = returns.rolling(window).std() * np.sqrt(trading_days)
+    if rolling_vol is None:
+        rolling_vol = returns.rolling(window).std() * np.sqrt(trading_days)
 
     plt.figure(figsize=(10, 4))
     plt.plot(rolling_vol.index, rolling_vol.values)
@@ -31,9 +33,10 @@ def plot_rolling_volatility(
     plt.show()
 
 
-def plot_drawdown(prices: pd.Series, ticker: str):
-    cumulative_max = prices.cummax()
-    drawdown = (prices - cumulative_max) / cumulative_max
+def plot_drawdown(prices: pd.Series, ticker: str, drawdown: pd.Series = None):
+    if drawdown is None:
+        cumulative_max = prices.cummax()
+        drawdown = (prices - cumulative_max) / cumulative_max
 
     plt.figure(figsize=(10, 4))
     plt.plot(drawdown.index, drawdown.values, color="red")
@@ -30,3 +30,24 @@ def plot_drawdown_duration(
     plt.ylabel("Days Underwater")
     plt.grid(True)
     plt.show()
+
+
+def plot_rolling_sharpe_surface(
+    rolling_sharpe: pd.DataFrame,
+    ticker: str
+):
+    """
+    Rolling Sharpe ratio for several windows (one column per window).
+    """
+    plt.figure(figsize=(10, 4))
+
+    for window in rolling_sharpe.columns:
+        plt.plot(rolling_sharpe.index, rolling_sharpe[window].values, label=f"{window}-Day")
+
+    plt.axhline(0, linestyle="--", linewidth=0.8)
+    plt.title(f"{ticker} Rolling Sharpe Ratio by Window")
+    plt.xlabel("Date")
+    plt.ylabel("Sharpe Ratio")
+    plt.legend()
+    plt.grid(True)
+    plt.show()